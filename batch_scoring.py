@@ -0,0 +1,68 @@
+import numpy as np
+
+# Punteggio vettoriale: le metriche sono una matrice intera (una riga per
+# classe, una colonna per metrica) e le categorie sono codici interi piccoli.
+# Il punteggio di ogni classe è il prodotto scalare tra la sua riga di metriche
+# e la riga della matrice dei pesi della sua categoria; la soglia PFV è un
+# vettore indicizzato per categoria. Pesi e soglie replicano calculate_score
+# e is_pfv di score_calculator.py.
+
+# Ordine delle categorie: la posizione è il codice intero della categoria
+CATEGORIES = ("simple_service", "controller", "interface_or_trait", "domain_class")
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+# Ordine delle colonne della matrice delle metriche
+METRIC_NAMES = ("complexity", "srp", "ocp", "isp", "dip")
+
+# Pesi per categoria (righe) e metrica (colonne)
+CATEGORY_WEIGHTS = np.array(
+    [
+        # complexity, srp, ocp, isp, dip
+        [1, 1, 0, 0, 0],  # simple_service
+        [1, 1, 1, 0, 0],  # controller
+        [0, 0, 0, 1, 1],  # interface_or_trait
+        [1, 1, 1, 1, 1],  # domain_class
+    ],
+    dtype=np.int64,
+)
+
+# Soglia PFV per categoria
+PFV_THRESHOLDS = np.array([5, 7, 7, 7], dtype=np.int64)
+
+
+# Funzione per convertire i nomi delle categorie in codici interi
+def encode_categories(categories):
+    return np.fromiter((CATEGORY_CODES[category] for category in categories), dtype=np.uint8)
+
+
+# Funzione per categorizzare un elenco di classi direttamente in codici.
+# score_calculator viene importato qui: columnar_output usa le costanti di
+# questo modulo durante un'elaborazione di score_calculator stesso.
+def categorize_batch(class_data_list):
+    from score_calculator import categorize_class
+
+    return encode_categories(categorize_class(class_data) for class_data in class_data_list)
+
+
+# Funzione per costruire la matrice delle metriche da un elenco di dizionari
+def metrics_matrix(metrics_list):
+    rows = [[metrics.get(name, 0) for name in METRIC_NAMES] for metrics in metrics_list]
+    return np.array(rows, dtype=np.int64).reshape(len(rows), len(METRIC_NAMES))
+
+
+# Funzione per calcolare i punteggi di tutte le classi in un colpo solo
+def score_batch(metrics, category_codes):
+    weights = CATEGORY_WEIGHTS[category_codes]
+    return np.einsum("ij,ij->i", metrics, weights)
+
+
+# Funzione per calcolare i flag PFV come confronto vettoriale con le soglie
+def pfv_batch(scores, category_codes):
+    return scores >= PFV_THRESHOLDS[category_codes]
+
+
+# Funzione per valutare un blocco di classi: restituisce codici categoria,
+# punteggi e flag PFV come array
+def evaluate_batch(metrics, category_codes):
+    scores = score_batch(metrics, category_codes)
+    return scores, pfv_batch(scores, category_codes)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark della pipeline di score_calculator.py
+
+Genera alberi sintetici di file PHP (1k, 10k, 100k, 1M classi) con
+dimensioni del codice simili a quelle di app/ (mediana ~2 KB, coda lunga),
+poi esegue la pipeline reale (class_scanner + run_stream, con blocchi,
+cache, worker e avanzamento) e salva throughput e tempo di ogni fase
+scan → cache → metrics → categorize → score → dump, misurati dallo
+StageProfiler, più il picco di memoria dell'elaborazione, in un file JSON.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from class_scanner import iter_classes
+from score_calculator import RunOptions, run_stream
+from scoring_profile import ProgressReporter, StageProfiler
+
+# Dimensioni di default degli alberi sintetici
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# File dei risultati del benchmark
+output_file = "benchmark_results.json"
+
+# File PHP per cartella nell'albero sintetico
+FILES_PER_DIRECTORY = 1_000
+
+# Fasi riportate, nell'ordine della pipeline, con la fase corrispondente di
+# StageProfiler: "scan" è la lettura dei file con estrazione delle classi
+STAGES = {"scan": "load", "cache": "cache", "metrics": "metrics",
+          "categorize": "categorize", "score": "score", "dump": "dump"}
+
+# Suffissi dei nomi: determinano la categoria della classe
+NAME_SUFFIXES = ("Service", "Controller", "Trait", "Interface", "", "Repository", "Model")
+
+# Frammenti di metodo usati per comporre i corpi delle classi sintetiche
+METHOD_BODIES = (
+    """        if ($request->has('{field}')) {{
+            $this->{field} = $request->input('{field}');
+        }} elseif ($this->{field} === null) {{
+            throw new \\InvalidArgumentException("Campo {field} mancante");
+        }}
+""",
+    """        foreach ($this->items as $key => $item) {{
+            // Normalizza {field} prima del salvataggio
+            $item->{field} = trim((string) $item->{field});
+            while ($item->needsRetry()) {{
+                $item->retry();
+            }}
+        }}
+""",
+    """        $result = $this->repository->find{Field}($id) ?? $this->defaults['{field}'];
+        return $result && $this->isValid($result) ? $result : null;
+""",
+    """        switch ($this->status) {{
+            case 'draft':
+                return $this->{field};
+            case 'published':
+                for ($i = 0; $i < count($this->versions); $i++) {{
+                    $this->versions[$i]->touch();
+                }}
+                break;
+        }}
+        try {{
+            $this->logger->info('{field} aggiornato', ['id' => $this->id]);
+        }} catch (\\Throwable $e) {{
+            report($e);
+        }}
+""",
+    """        $query = <<<SQL
+            SELECT * FROM {field}_table WHERE id = :id
+        SQL;
+        return DB::select($query, ['id' => $id]);
+""",
+)
+
+FIELDS = ("title", "price", "owner", "status", "collection", "wallet", "creator", "traits")
+
+
+# Funzione per generare il sorgente di una classe sintetica
+def generate_class_code(name, rng):
+    method_count = max(1, min(80, int(rng.lognormvariate(1.3, 0.9))))
+    parts = [
+        "namespace App\\Services\\Generated;\n\n",
+        "use Illuminate\\Support\\Facades\\DB;\nuse Psr\\Log\\LoggerInterface;\n\n",
+        f"class {name} extends BaseComponent implements ComponentInterface\n{{\n",
+        "    public function __construct(private LoggerInterface $logger, private $repository)\n    {\n    }\n\n",
+    ]
+    for index in range(method_count):
+        field = FIELDS[rng.randrange(len(FIELDS))]
+        body = METHOD_BODIES[rng.randrange(len(METHOD_BODIES))]
+        parts.append(f"    /**\n     * Gestisce {field}\n     */\n    public function handle{field.title()}{index}($request, $id = null)\n    {{\n")
+        parts.append(body.format(field=field, Field=field.title()))
+        parts.append("    }\n\n")
+    parts.append("}\n")
+    return "".join(parts)
+
+
+# Funzione per generare l'albero sintetico: un file PHP per classe,
+# FILES_PER_DIRECTORY file per cartella
+def write_synthetic_tree(root, size, seed=0):
+    rng = random.Random(seed)
+    for index in range(size):
+        name = f"Synthetic{index}{NAME_SUFFIXES[rng.randrange(len(NAME_SUFFIXES))]}"
+        directory = os.path.join(root, "Generated", f"{index // FILES_PER_DIRECTORY:04d}")
+        if index % FILES_PER_DIRECTORY == 0:
+            os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{name}.php"), "w", encoding="utf-8") as file:
+            file.write("<?php\n\n")
+            file.write(generate_class_code(name, rng))
+
+
+# Funzione per misurare la pipeline reale su un albero già generato. Con più
+# worker i tempi di metrics/categorize/score sono sommati sui processi e il
+# picco di memoria riguarda solo il processo principale.
+def benchmark_tree(root, results_path, size, workers, track_memory):
+    profiler = StageProfiler()
+    options = RunOptions(workers=workers, profiler=profiler, progress=ProgressReporter(5.0))
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        run_stream(iter_classes(root), results_path, options)
+        total_seconds = time.perf_counter() - started
+        peak_bytes = tracemalloc.get_traced_memory()[1] if track_memory else None
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+
+    classes = profiler.classes
+    return {
+        "size": size,
+        "classes": classes,
+        "workers": workers,
+        "source_bytes": profiler.bytes,
+        "output_bytes": os.path.getsize(results_path),
+        "total_seconds": round(total_seconds, 6),
+        "classes_per_sec": round(classes / total_seconds, 2) if total_seconds else None,
+        "stages": {
+            stage: {
+                "seconds": round(profiler.seconds[profile_stage], 6),
+                "classes_per_sec": (
+                    round(classes / profiler.seconds[profile_stage], 2) if profiler.seconds[profile_stage] else None
+                ),
+            }
+            for stage, profile_stage in STAGES.items()
+        },
+        "peak_bytes": peak_bytes,
+        # ru_maxrss è in KB su Linux e in byte su macOS
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark della pipeline di score_calculator.py")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Numero di classi per ogni albero sintetico, separati da virgola")
+    parser.add_argument("--output", default=output_file, help="File JSON con i risultati")
+    parser.add_argument("--workdir", default=None, help="Cartella per gli alberi generati (default: temporanea)")
+    parser.add_argument("--workers", type=int, default=1, help="Processi per il calcolo (come score_calculator)")
+    parser.add_argument("--seed", type=int, default=0, help="Seme del generatore sintetico")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Non misura il picco di memoria (tracemalloc rallenta la pipeline)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    workdir = args.workdir or tempfile.mkdtemp(prefix="score_bench_")
+    os.makedirs(workdir, exist_ok=True)
+
+    runs = []
+    try:
+        for size in sizes:
+            root = os.path.join(workdir, f"app_{size}")
+            results_path = os.path.join(workdir, f"scored_{size}.jsonl")
+            if not os.path.exists(root):
+                print(f"Generazione albero sintetico: {size} file PHP...")
+                write_synthetic_tree(root, size, args.seed)
+
+            print(f"Benchmark su {size} classi...")
+            run = benchmark_tree(root, results_path, size, args.workers, not args.no_memory)
+            runs.append(run)
+            print(f"  {run['classes_per_sec']} classi/s, " + ", ".join(
+                f"{stage} {values['seconds']:.3f}s" for stage, values in run["stages"].items()
+            ))
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "memory_tracking": not args.no_memory,
+        "runs": runs,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+    print(f"Risultati del benchmark salvati in: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Controllo di coerenza tra i file trait_elements.php di tutte le lingue (utilizzabile come hook di pre-commit)
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+from translate_traits import LOCALES, SOURCE_LOCALE, lang_dir, parse_trait_file, trait_path
+
+# Cache delle voci già lette, invalidata dalla data di modifica dei file
+check_cache_file = ".trait_check_cache.json"
+
+
+# Lettura dei file di lingua con cache su disco: un file viene rianalizzato
+# solo se data di modifica o dimensione sono cambiate dall'ultimo controllo
+class TraitParseCache:
+    def __init__(self, path=check_cache_file):
+        self.path = path
+        self.entries = {}
+        self.changed = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    # Voci del file come dizionario (sezione, chiave, occorrenza) -> valore,
+    # oppure None se il file non esiste
+    def values(self, path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature = [stat.st_mtime_ns, stat.st_size]
+        cached = self.entries.get(path)
+        if cached is None or cached["signature"] != signature:
+            items = [list(item[1:5]) for item in parse_trait_file(path) if not isinstance(item, str)]
+            cached = self.entries[path] = {"signature": signature, "items": items}
+            self.changed = True
+        return {(section, key, occurrence): value for section, key, occurrence, value in cached["items"]}
+
+    def save(self):
+        if self.path and self.changed:
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(self.entries, file, ensure_ascii=False, separators=(",", ":"))
+
+
+# Funzione per confrontare una lingua con l'italiano, sezione per sezione:
+# chiavi mancanti ed extra, valori identici all'italiano e traduzioni usate
+# per più chiavi diverse della stessa sezione
+def check_locale(reference, values):
+    sections = defaultdict(lambda: {"missing": [], "extra": [], "untranslated": [], "duplicate_targets": {}})
+    expected, present = set(reference), set(values)
+    for section, key, occurrence in sorted(expected - present):
+        sections[section]["missing"].append(key)
+    for section, key, occurrence in sorted(present - expected):
+        sections[section]["extra"].append(key)
+
+    targets = defaultdict(set)
+    for entry in sorted(expected & present):
+        section, key, _occurrence = entry
+        if values[entry] == reference[entry]:
+            sections[section]["untranslated"].append(key)
+        targets[(section, values[entry])].add(key)
+    for (section, value), keys in sorted(targets.items()):
+        if len(keys) > 1:
+            sections[section]["duplicate_targets"][value] = sorted(keys)
+
+    return {
+        section: {problem: found for problem, found in problems.items() if found}
+        for section, problems in sorted(sections.items())
+        if any(problems.values())
+    }
+
+
+# Funzione per controllare tutte le lingue. Per la lingua di riferimento
+# contano solo le traduzioni duplicate.
+def check_locales(locales=LOCALES, directory=lang_dir, cache=None):
+    cache = cache or TraitParseCache(None)
+    reference = cache.values(trait_path(SOURCE_LOCALE, directory))
+    if reference is None:
+        raise FileNotFoundError(f"File di riferimento mancante: {trait_path(SOURCE_LOCALE, directory)}")
+    report = {}
+    for locale in locales:
+        values = cache.values(trait_path(locale, directory))
+        if values is None:
+            report[locale] = {"missing_file": True}
+            continue
+        result = check_locale(reference, values)
+        if locale == SOURCE_LOCALE:
+            result = {
+                section: {"duplicate_targets": problems["duplicate_targets"]}
+                for section, problems in result.items()
+                if "duplicate_targets" in problems
+            }
+        report[locale] = result
+    return report
+
+
+# Funzione per contare i problemi che fanno fallire il controllo: chiavi
+# mancanti ed extra sempre, valori non tradotti e duplicati solo con --strict
+def count_errors(report, strict=False):
+    blocking = ("missing", "extra") + (("untranslated", "duplicate_targets") if strict else ())
+    errors = 0
+    for sections in report.values():
+        if sections.get("missing_file"):
+            errors += 1
+            continue
+        for problems in sections.values():
+            errors += sum(len(problems.get(problem, ())) for problem in blocking)
+    return errors
+
+
+def _print_report(report, directory):
+    for locale, sections in report.items():
+        path = trait_path(locale, directory)
+        if sections.get("missing_file"):
+            print(f"{path}: file mancante")
+            continue
+        if not sections:
+            print(f"{path}: ok")
+            continue
+        for section, problems in sections.items():
+            for key in problems.get("missing", ()):
+                print(f"{path}: [{section}] chiave mancante: {key}")
+            for key in problems.get("extra", ()):
+                print(f"{path}: [{section}] chiave non presente in {SOURCE_LOCALE}: {key}")
+            untranslated = problems.get("untranslated", ())
+            if untranslated:
+                print(f"{path}: [{section}] {len(untranslated)} valori uguali all'italiano: {', '.join(untranslated)}")
+            for value, keys in problems.get("duplicate_targets", {}).items():
+                print(f"{path}: [{section}] '{value}' usato per {', '.join(keys)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Controlla chiavi e traduzioni di trait_elements.php in tutte le lingue")
+    parser.add_argument("--lang-dir", default=lang_dir, help=f"Cartella delle lingue (default: {lang_dir})")
+    parser.add_argument("--locales", default=",".join(LOCALES), help="Lingue da controllare, separate da virgola")
+    parser.add_argument("--cache", default=check_cache_file, help=f"Cache delle analisi (default: {check_cache_file})")
+    parser.add_argument("--no-cache", action="store_true", help="Rianalizza tutti i file")
+    parser.add_argument("--strict", action="store_true",
+                        help="Fallisce anche per valori non tradotti e traduzioni duplicate")
+    parser.add_argument("--json", action="store_true", help="Stampa il report in JSON")
+    parser.add_argument("--quiet", action="store_true", help="Stampa solo l'esito finale")
+    args = parser.parse_args()
+
+    cache = TraitParseCache(None if args.no_cache else args.cache)
+    locales = tuple(locale.strip() for locale in args.locales.split(",") if locale.strip())
+    report = check_locales(locales, args.lang_dir, cache)
+    cache.save()
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+    elif not args.quiet:
+        _print_report(report, args.lang_dir)
+    errors = count_errors(report, args.strict)
+    if errors:
+        print(f"Controllo traduzioni fallito: {errors} problemi", file=sys.stderr)
+        sys.exit(1)
+    print(f"Controllo traduzioni superato ({len(locales)} lingue)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
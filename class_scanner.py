@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from php_scanner import extract_class_spans
+
+# Cartella sorgente e dataset di default (come in bash_files/training.sh)
+input_dir = "app"
+output_file = "dataset_ai.json"
+
+# Dimensione dei blocchi letti dal disco da iter_dataset
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Thread per la lettura dei file e file letti per ogni blocco
+READ_WORKERS = 8
+READ_BATCH = 64
+
+
+# Funzione per trovare i file PHP sotto la cartella indicata, in ordine
+# alfabetico del percorso come "find | sort" in training.sh
+def iter_php_files(root):
+    paths = []
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(".php") and entry.is_file():
+                    paths.append(entry.path)
+    paths.sort()
+    return paths
+
+
+def _read_file(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+# Funzione per estrarre le classi dai file indicati: i file vengono letti da
+# un pool di thread a blocchi, le classi escono nell'ordine dei file.
+# Ogni voce contiene nome, percorso, offset in byte e il solo corpo della classe.
+def iter_file_classes(paths, workers=READ_WORKERS):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for offset in range(0, len(paths), READ_BATCH):
+            batch = paths[offset:offset + READ_BATCH]
+            for path, raw in zip(batch, executor.map(_read_file, batch)):
+                for _kind, name, start, end in extract_class_spans(raw):
+                    yield {
+                        "name": name,
+                        "path": path,
+                        "span": [start, end],
+                        "code": raw[start:end].decode("utf-8", errors="replace"),
+                    }
+
+
+# Funzione per estrarre le classi da tutti i file PHP sotto la cartella indicata
+def iter_classes(root=input_dir, workers=READ_WORKERS):
+    return iter_file_classes(iter_php_files(root), workers)
+
+
+# Funzione per scrivere il dataset come array JSON, un elemento alla volta.
+# Se non ci sono classi il risultato è comunque un array valido ("[]").
+def write_dataset(classes, path=output_file):
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for class_data in classes:
+            file.write(",\n" if count else "\n")
+            file.write(json.dumps(class_data, ensure_ascii=False))
+            count += 1
+        file.write("\n]\n" if count else "]\n")
+    return count
+
+
+# Funzione per leggere il dataset un elemento alla volta.
+# Accetta sia un array JSON (formato di training.sh) sia un file JSONL:
+# in memoria resta solo l'elemento corrente più un blocco di lettura.
+def iter_dataset(path, chunk_size=STREAM_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as file:
+        buffer = ""
+        eof = False
+
+        # Legge altri dati dal file, restituisce False a fine file
+        def fill():
+            nonlocal buffer, eof
+            chunk = file.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer += chunk
+            return True
+
+        # Salta gli spazi iniziali per capire il formato del file
+        while not eof and not buffer.lstrip():
+            buffer = ""
+            fill()
+        buffer = buffer.lstrip()
+        if not buffer:
+            return
+        in_array = buffer[0] == "["
+        pos = 1 if in_array else 0
+
+        while True:
+            # Salta spazi e separatori fino all'inizio del prossimo elemento
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n" + ("," if in_array else ""):
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    break
+            if pos >= len(buffer):
+                if in_array:
+                    raise ValueError(f"Array JSON non terminato in {path}")
+                return
+            if in_array and buffer[pos] == "]":
+                return
+
+            # Decodifica l'elemento, leggendo altri blocchi se è incompleto
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if not fill():
+                        raise
+                    continue
+                if end == len(buffer) and fill():
+                    continue
+                break
+
+            yield item
+            buffer = buffer[end:]
+            pos = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estrae classi, interfacce e trait PHP in dataset_ai.json")
+    parser.add_argument("input_dir", nargs="?", default=input_dir, help="Cartella con i sorgenti PHP")
+    parser.add_argument("--output", default=output_file, help="Dataset da generare")
+    parser.add_argument("--workers", type=int, default=READ_WORKERS, help="Thread per la lettura dei file")
+    args = parser.parse_args()
+
+    count = write_dataset(iter_classes(args.input_dir, args.workers), args.output)
+    print(f"{count} classi/interfacce/trait salvate in: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import hashlib
+import os
+
+# Cartella di default per i sorgenti referenziati dai risultati
+blob_dir = "code_blobs"
+
+
+# Archivio dei sorgenti indirizzato per contenuto: ogni codice distinto viene
+# scritto una sola volta in <cartella>/<hash[:2]>/<hash>.php e i risultati
+# contengono solo l'hash ("code_blob") al posto del campo "code".
+class BlobStore:
+    def __init__(self, directory=blob_dir):
+        self.directory = directory
+        self.written = 0
+        self._known = set()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def digest(code):
+        return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest[:2], f"{digest}.php")
+
+    # Salva il codice se non è già presente e ne restituisce l'hash
+    def put(self, code):
+        digest = self.digest(code)
+        if digest in self._known:
+            return digest
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8", newline="") as file:
+                file.write(code)
+            os.replace(temp_path, path)
+            self.written += 1
+        self._known.add(digest)
+        return digest
+
+    def get(self, digest):
+        with open(self.path(digest), "r", encoding="utf-8", newline="") as file:
+            return file.read()
+
+    # Sostituisce il campo "code" di un risultato con il riferimento al blob
+    def externalize(self, result):
+        externalized = {}
+        for key, value in result.items():
+            if key == "code":
+                externalized["code_blob"] = self.put(value)
+            else:
+                externalized[key] = value
+        return externalized
+
+
+# Funzione per leggere il codice di un risultato, solo quando serve
+def load_code(result, store):
+    if "code" in result:
+        return result["code"]
+    return store.get(result["code_blob"])
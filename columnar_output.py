@@ -0,0 +1,117 @@
+import os
+import zipfile
+
+# File di output colonnare binario (opzionale, --columnar di score_calculator)
+columnar_file = "scored_classes_with_categories.npz"
+
+# NumPy, pyarrow e batch_scoring (che usa NumPy) vengono importati solo
+# quando si scrive o si legge un file colonnare: score_calculator importa
+# columnar_file a ogni avvio e carica NumPy solo con --columnar.
+
+
+# Funzione per importare pyarrow, facoltativo: senza, si usa solo il formato .npz
+def _pyarrow(path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError(f"Per scrivere {path} serve pyarrow (pip install pyarrow), oppure usare .npz") from None
+    return pa, pq
+
+
+# Scrittura dei risultati in formato colonnare binario.
+# - .npz (default): un array NumPy per colonna, non compresso, così ogni
+#   colonna si può mappare in memoria con load_columnar() senza copiarla;
+# - .arrow: file Arrow IPC, mappabile con pyarrow.memory_map;
+# - .parquet: Parquet, per strumenti di analisi esterni.
+# I codici categoria fanno riferimento a batch_scoring.CATEGORIES, salvato
+# anch'esso nel file.
+class ColumnarWriter:
+    def __init__(self, path=columnar_file):
+        self.path = path
+        self.format = os.path.splitext(path)[1].lower().lstrip(".") or "npz"
+        if self.format in ("arrow", "parquet"):
+            _pyarrow(path)
+        from batch_scoring import CATEGORY_CODES, METRIC_NAMES
+
+        self._category_codes = CATEGORY_CODES
+        self._metric_names = METRIC_NAMES
+        # Colonne, nell'ordine: nome, codice categoria, metriche, punteggio, PFV
+        self._columns = {column: [] for column in ("name", "category") + METRIC_NAMES + ("score", "is_pfv")}
+
+    def add(self, result):
+        columns = self._columns
+        metrics = result["metrics"]
+        columns["name"].append(result["name"])
+        columns["category"].append(self._category_codes[result["category"]])
+        for metric in self._metric_names:
+            columns[metric].append(metrics.get(metric, 0))
+        columns["score"].append(result["score"])
+        columns["is_pfv"].append(result["is_pfv"])
+
+    def arrays(self):
+        import numpy as np
+
+        columns = self._columns
+        arrays = {"name": np.array(columns["name"], dtype=str)}
+        arrays["category"] = np.array(columns["category"], dtype=np.uint8)
+        for metric in self._metric_names + ("score",):
+            arrays[metric] = np.array(columns[metric], dtype=np.int32)
+        arrays["is_pfv"] = np.array(columns["is_pfv"], dtype=np.bool_)
+        return arrays
+
+    def close(self):
+        import numpy as np
+        from batch_scoring import CATEGORIES
+
+        arrays = self.arrays()
+        if self.format == "npz":
+            with open(self.path, "wb") as file:
+                np.savez(file, categories=np.array(CATEGORIES), **arrays)
+            return
+
+        pa, pq = _pyarrow(self.path)
+        table = pa.table(
+            {column: pa.array(values) for column, values in arrays.items()},
+            metadata={"categories": ",".join(CATEGORIES)},
+        )
+        if self.format == "parquet":
+            pq.write_table(table, self.path)
+        else:
+            with pa.OSFile(self.path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+
+# Funzione per leggere un file .npz scritto da ColumnarWriter mappando in
+# memoria ogni colonna (np.load non supporta mmap_mode sui file .npz).
+# Restituisce un dizionario colonna -> array in sola lettura.
+def load_columnar(path=columnar_file):
+    import numpy as np
+
+    columns = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: la colonna {info.filename} è compressa e non si può mappare in memoria")
+
+            # Salta l'intestazione locale dello zip (30 byte + nome + extra)
+            file.seek(info.header_offset + 26)
+            name_length = int.from_bytes(file.read(2), "little")
+            extra_length = int.from_bytes(file.read(2), "little")
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+            column = info.filename[:-len(".npy")]
+            if 0 in shape:
+                columns[column] = np.empty(shape, dtype=dtype)
+                continue
+            columns[column] = np.memmap(
+                path, dtype=dtype, mode="r", offset=file.tell(), shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return columns
@@ -0,0 +1,404 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from class_scanner import READ_WORKERS, iter_php_files
+from php_scanner import ANONYMOUS_CLASS_FOLLOWERS, DECLARATION_KEYWORDS, MEMBER_ACCESS, iter_tokens
+
+# Indice delle dipendenze tra classi (opzionale, --dependencies di score_calculator)
+dependencies_file = "dependency_graph.json"
+
+# Nomi che compaiono come tipi o prima di "::" ma non sono classi
+BUILTIN_TYPES = frozenset((
+    "self", "static", "parent", "array", "string", "int", "float", "bool", "void", "mixed",
+    "callable", "iterable", "object", "null", "false", "true", "never", "integer", "double", "boolean",
+    "class",
+))
+
+# Parole riservate che possono precedere una variabile senza essere un tipo
+# (return $x, foreach (... as $y), public $z, ...)
+RESERVED_WORDS = frozenset((
+    "return", "echo", "print", "global", "as", "and", "or", "xor", "clone", "yield", "throw",
+    "case", "else", "include", "include_once", "require", "require_once", "const", "public",
+    "private", "protected", "var", "readonly", "abstract", "final", "static", "function", "fn",
+    "do", "try", "finally", "default", "from", "goto", "new", "instanceof",
+))
+
+# Parole chiave dopo le quali il nome successivo è una classe referenziata
+REFERENCE_KEYWORDS = frozenset(("new", "extends", "implements", "instanceof", "insteadof"))
+
+
+# Funzione per risolvere un nome di classe nel suo nome completo (FQCN)
+# secondo le regole PHP: assoluto se inizia con "\", altrimenti tramite gli
+# alias importati con "use", altrimenti relativo al namespace corrente.
+def resolve_name(name, namespace, imports):
+    if name.startswith("\\"):
+        return name[1:]
+    head, _separator, rest = name.partition("\\")
+    alias = imports.get(head.lower())
+    if alias is not None:
+        return f"{alias}\\{rest}" if rest else alias
+    return f"{namespace}\\{name}" if namespace else name
+
+
+# Funzione per estrarre le dipendenze delle classi dichiarate in un file.
+# Considera import "use", "new X", "X::", extends/implements/instanceof,
+# trait usati nella classe e type hint (parametri, proprietà, tipi di ritorno).
+# Restituisce {FQCN della classe: insieme dei FQCN da cui dipende}.
+def extract_dependencies(source):
+    namespace = ""
+    imports = {}
+    classes = {}
+    depth = 0
+    current = None  # (FQCN, profondità del corpo)
+    pending_class = None
+    previous = None
+    type_candidates = []
+    return_type = False
+    tokens = list(iter_tokens(source))
+    index = 0
+    count = len(tokens)
+
+    def add_reference(name):
+        if current is None or name.lower().lstrip("\\") in BUILTIN_TYPES:
+            return
+        resolved = resolve_name(name, namespace, imports)
+        if resolved != current[0]:
+            classes[current[0]].add(resolved)
+
+    while index < count:
+        kind, text, _start, _end = tokens[index]
+        keyword = text.lower() if kind == "name" else None
+
+        if keyword == "namespace" and depth == 0:
+            index += 1
+            if index < count and tokens[index][0] == "name":
+                namespace = tokens[index][1].lstrip("\\")
+            previous = None
+            index += 1
+            continue
+
+        if keyword == "use" and depth == 0 and current is None:
+            # Import a livello di file: use A\B; use A\B as C; use A\{B, C as D};
+            index += 1
+            if index < count and tokens[index][1].lower() in ("function", "const"):
+                while index < count and tokens[index][1] != ";":
+                    index += 1
+                previous = ";"
+                index += 1
+                continue
+            prefix = ""
+            target = None
+            while index < count and tokens[index][1] != ";":
+                token_kind, token_text = tokens[index][0], tokens[index][1]
+                if token_text == "{":
+                    prefix = target.rstrip("\\") + "\\" if target else ""
+                    target = None
+                elif token_kind == "name" and token_text.lower() == "as":
+                    index += 1
+                    imports[tokens[index][1].lower()] = (prefix + target).lstrip("\\")
+                    target = None
+                elif token_kind == "name":
+                    target = token_text
+                elif token_text in (",", "}") and target:
+                    full_name = (prefix + target).lstrip("\\")
+                    imports[full_name.rpartition("\\")[2].lower()] = full_name
+                    target = None
+                index += 1
+            if target:
+                full_name = (prefix + target).lstrip("\\")
+                imports[full_name.rpartition("\\")[2].lower()] = full_name
+            previous = ";"
+            index += 1
+            continue
+
+        if kind == "name" and previous not in MEMBER_ACCESS:
+            # new class extends Foo { ... } è una classe anonima, non una dichiarazione
+            if (keyword in DECLARATION_KEYWORDS and current is None and (previous or "").lower() != "new"
+                    and index + 1 < count and tokens[index + 1][0] == "name"
+                    and tokens[index + 1][1].lower() not in ANONYMOUS_CLASS_FOLLOWERS):
+                index += 1
+                name = tokens[index][1]
+                pending_class = f"{namespace}\\{name}" if namespace else name
+                classes.setdefault(pending_class, set())
+                previous = name
+                index += 1
+                continue
+            if keyword in REFERENCE_KEYWORDS or (keyword == "use" and current is not None):
+                # Il nome successivo (e per implements/use quelli separati da virgole)
+                index += 1
+                while index < count:
+                    token_kind, token_text = tokens[index][0], tokens[index][1]
+                    if token_kind == "name" and pending_class is not None and current is None:
+                        # extends/implements prima della graffa: la classe non è ancora aperta
+                        if token_text.lower() not in BUILTIN_TYPES:
+                            classes[pending_class].add(resolve_name(token_text, namespace, imports))
+                    elif token_kind == "name":
+                        add_reference(token_text)
+                    if keyword in ("implements", "use", "insteadof") and index + 1 < count and tokens[index + 1][1] == ",":
+                        index += 2
+                        continue
+                    break
+                previous = tokens[index][1] if index < count else None
+                index += 1
+                continue
+            if index + 1 < count and tokens[index + 1][1] == "::":
+                add_reference(text)
+            elif return_type:
+                add_reference(text)
+            elif keyword not in RESERVED_WORDS:
+                type_candidates.append(text)
+            previous = text
+            index += 1
+            continue
+
+        if kind == "variable" and type_candidates:
+            for name in type_candidates:
+                add_reference(name)
+        if kind != "name" and text not in ("|", "&", "?"):
+            type_candidates = []
+
+        if text == ":" and previous == ")":
+            return_type = True
+        elif text in ("{", ";", "=>"):
+            return_type = False
+
+        if text == "{":
+            if pending_class is not None:
+                current = (pending_class, depth)
+                pending_class = None
+            depth += 1
+        elif text == "}":
+            depth -= 1
+            if current is not None and depth == current[1]:
+                current = None
+        previous = text
+        index += 1
+    return classes
+
+
+def _read_source(path):
+    with open(path, "rb") as file:
+        return file.read().decode("utf-8", errors="replace")
+
+
+# Grafo delle dipendenze tra classi dell'intero repository.
+# Le adiacenze sono sparse (dizionari di insiemi, in avanti e all'indietro);
+# per ogni file si ricorda quali archi ha contribuito, così l'aggiornamento
+# di un file modificato tocca solo le sue classi e non ricostruisce il grafo.
+class DependencyGraph:
+    def __init__(self):
+        self.file_edges = {}  # percorso -> {classe: insieme di dipendenze}
+        self.declared_in = {}  # classe -> insieme dei file che la dichiarano
+        self.outgoing = {}  # classe -> insieme di dipendenze
+        self.incoming = {}  # classe -> insieme delle classi che dipendono da essa
+        self._components = None
+        self._cycle_sizes = None
+
+    # Costruisce il grafo leggendo tutti i file PHP della cartella
+    @classmethod
+    def build(cls, root, workers=READ_WORKERS):
+        graph = cls()
+        paths = iter_php_files(root)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for path, source in zip(paths, executor.map(_read_source, paths)):
+                graph.update_file(path, source)
+        return graph
+
+    # Aggiorna (o rimuove, con source=None) il contributo di un file.
+    # I file sono indicizzati per percorso assoluto, così --scan relativo o
+    # assoluto e i percorsi restituiti da git indicano lo stesso file.
+    def update_file(self, path, source):
+        path = os.path.abspath(path)
+        self._components = None
+        self._cycle_sizes = None
+        old_edges = self.file_edges.pop(path, {})
+        new_edges = extract_dependencies(source) if source is not None else {}
+        if new_edges:
+            self.file_edges[path] = new_edges
+
+        for class_name in old_edges.keys() - new_edges.keys():
+            self.declared_in[class_name].discard(path)
+            if not self.declared_in[class_name]:
+                del self.declared_in[class_name]
+        for class_name in new_edges:
+            self.declared_in.setdefault(class_name, set()).add(path)
+        for class_name in old_edges.keys() | new_edges.keys():
+            self._refresh_outgoing(class_name)
+
+    # Aggiorna i file indicati leggendoli dal disco; quelli non più esistenti
+    # vengono rimossi dal grafo
+    def update_files(self, paths):
+        for path in paths:
+            path = os.path.abspath(path)
+            source = _read_source(path) if os.path.exists(path) else None
+            self.update_file(path, source)
+
+    def _refresh_outgoing(self, class_name):
+        dependencies = set()
+        for path in self.declared_in.get(class_name, ()):
+            dependencies |= self.file_edges[path][class_name]
+        old = self.outgoing.get(class_name, set())
+        for target in old - dependencies:
+            self.incoming[target].discard(class_name)
+            if not self.incoming[target]:
+                del self.incoming[target]
+        for target in dependencies - old:
+            self.incoming.setdefault(target, set()).add(class_name)
+        if dependencies:
+            self.outgoing[class_name] = dependencies
+        else:
+            self.outgoing.pop(class_name, None)
+
+    def classes(self):
+        return self.declared_in.keys()
+
+    # Classi dichiarate in un file (per collegare i risultati al grafo)
+    def classes_in_file(self, path):
+        return self.file_edges.get(os.path.abspath(path), {}).keys()
+
+    def fan_out(self, class_name, internal=False):
+        dependencies = self.outgoing.get(class_name, ())
+        if internal:
+            return sum(1 for target in dependencies if target in self.declared_in)
+        return len(dependencies)
+
+    def fan_in(self, class_name):
+        return len(self.incoming.get(class_name, ()))
+
+    # Classi raggiungibili seguendo le dipendenze (visita in ampiezza)
+    def transitive_reach(self, class_name):
+        seen = {class_name}
+        queue = deque((class_name,))
+        while queue:
+            for target in self.outgoing.get(queue.popleft(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        seen.discard(class_name)
+        return seen
+
+    # Componenti fortemente connesse con più di una classe (cicli di
+    # dipendenze), con l'algoritmo di Tarjan in forma iterativa
+    def cycles(self):
+        if self._components is None:
+            self._components = self._strongly_connected_components()
+        return self._components
+
+    # Dimensione del ciclo a cui appartiene la classe (0 se non è in un ciclo)
+    def cycle_size(self, class_name):
+        if self._cycle_sizes is None:
+            self._cycle_sizes = {
+                member: len(component) for component in self.cycles() for member in component
+            }
+        return self._cycle_sizes.get(class_name, 0)
+
+    def _strongly_connected_components(self):
+        index_of = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        counter = 0
+        for root in self.outgoing:
+            if root in index_of:
+                continue
+            work = [(root, iter(self.outgoing.get(root, ())))]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, targets = work[-1]
+                advanced = False
+                for target in targets:
+                    if target not in index_of:
+                        index_of[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.outgoing.get(target, ()))))
+                        advanced = True
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[target])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        components.append(frozenset(component))
+        return components
+
+    def save(self, path=dependencies_file):
+        data = {
+            "files": {
+                file_path: {class_name: sorted(targets) for class_name, targets in edges.items()}
+                for file_path, edges in sorted(self.file_edges.items())
+            }
+        }
+        with open(path, "w") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path=dependencies_file):
+        graph = cls()
+        with open(path, "r") as file:
+            data = json.load(file)
+        for file_path, edges in data["files"].items():
+            file_path = os.path.abspath(file_path)
+            graph.file_edges[file_path] = {class_name: set(targets) for class_name, targets in edges.items()}
+            for class_name in edges:
+                graph.declared_in.setdefault(class_name, set()).add(file_path)
+        for class_name in graph.declared_in:
+            graph._refresh_outgoing(class_name)
+        return graph
+
+
+# Metriche di accoppiamento integrate in score_calculator (--dependencies):
+# aggiunge a ogni risultato fan-in, fan-out (totale e verso classi del
+# repository) e la dimensione dell'eventuale ciclo di dipendenze.
+# I valori dipendono dall'intero grafo, quindi con --since vengono
+# ricalcolati anche per le classi non rielaborate (refresh = True).
+class DependencyCoupling:
+    refresh = True
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._by_short_name = {}
+        for class_name in graph.classes():
+            self._by_short_name.setdefault(class_name.rpartition("\\")[2], []).append(class_name)
+
+    def annotate(self, result):
+        class_name = self._resolve(result)
+        if class_name is None:
+            return
+        graph = self.graph
+        result["coupling"] = {
+            "fan_in": graph.fan_in(class_name),
+            "fan_out": graph.fan_out(class_name),
+            "fan_out_internal": graph.fan_out(class_name, internal=True),
+            "cycle_size": graph.cycle_size(class_name),
+        }
+
+    # Trova il FQCN della classe del risultato tra quelle dichiarate nel suo file
+    def _resolve(self, result):
+        name = result.get("name", "")
+        if "path" in result:
+            for class_name in self.graph.classes_in_file(result["path"]):
+                if class_name.rpartition("\\")[2] == name:
+                    return class_name
+            return None
+        matches = self._by_short_name.get(name, ())
+        return matches[0] if len(matches) == 1 else None
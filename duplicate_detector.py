@@ -0,0 +1,217 @@
+import argparse
+import json
+import random
+import zlib
+from collections import defaultdict
+
+from class_scanner import iter_dataset
+from class_scanner import output_file as dataset_file
+from php_scanner import iter_tokens, metrics_source
+
+# Cluster di classi quasi duplicate (opzionale, --duplicates di score_calculator)
+duplicates_file = "scored_duplicates.json"
+
+# Parametri MinHash/LSH: 128 permutazioni divise in 16 bande da 8 righe.
+# Due classi con similarità di Jaccard s finiscono nello stesso bucket in
+# almeno una banda con probabilità 1 - (1 - s^8)^16: ~0.97 per s = 0.8 e
+# ~0.01 per s = 0.3, quindi si confrontano quasi solo le coppie simili.
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Token per shingle e soglia di similarità di default
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+# Le classi troppo piccole (interfacce vuote, DTO) sono tutte simili tra loro
+MIN_SHINGLES = 30
+
+# Primo di Mersenne per le permutazioni (a * x + b) mod P
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+# Funzione per ridurre il sorgente a una sequenza di token normalizzati:
+# variabili e stringhe perdono il nome/valore, così un copia-incolla con
+# variabili rinominate resta riconoscibile
+def normalized_tokens(source):
+    for kind, text, _start, _end in iter_tokens(source):
+        if kind == "variable":
+            yield "$"
+        elif kind == "string":
+            yield "''"
+        elif kind == "name":
+            yield text.lower()
+        else:
+            yield text
+
+
+# Funzione per calcolare l'insieme degli shingle (hash a 32 bit di
+# SHINGLE_SIZE token consecutivi)
+def shingles(source):
+    tokens = list(normalized_tokens(source))
+    return {
+        zlib.crc32("\x1f".join(tokens[index:index + SHINGLE_SIZE]).encode("utf-8"))
+        for index in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+# Firme MinHash: per ogni permutazione il minimo di (a * x + b) mod P sugli
+# shingle. Con a < 2^31 e x < 2^32 il prodotto resta sotto 2^63, quindi il
+# calcolo vettoriale in uint64 non va in overflow. NumPy viene importato
+# qui e non dal modulo, così score_calculator lo carica solo con --duplicates.
+class MinHasher:
+    def __init__(self, num_permutations=NUM_PERMUTATIONS, seed=1):
+        rng = random.Random(seed)
+        self.a = [rng.randrange(1, 1 << 31) for _ in range(num_permutations)]
+        self.b = [rng.randrange(0, 1 << 32) for _ in range(num_permutations)]
+        try:
+            import numpy as np
+        except ImportError:  # NumPy è facoltativo: senza, le firme si calcolano in Python puro
+            np = None
+        self._np = np
+        if np is not None:
+            self._a = np.array(self.a, dtype=np.uint64)[:, None]
+            self._b = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def signature(self, shingle_set):
+        np = self._np
+        if np is not None:
+            values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+            hashed = (self._a * values + self._b) % np.uint64(MERSENNE_PRIME)
+            return tuple(int(value) for value in hashed.min(axis=1))
+        return tuple(
+            min((a * value + b) % MERSENNE_PRIME for value in shingle_set)
+            for a, b in zip(self.a, self.b)
+        )
+
+
+# Funzione per stimare la similarità di Jaccard da due firme
+def estimated_similarity(first, second):
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+# Rilevatore di classi quasi duplicate: le firme vengono raggruppate per
+# banda in bucket LSH; solo le classi che condividono un bucket diventano
+# coppie candidate, poi verificate con la similarità stimata. Il costo è
+# lineare nel numero di classi più il numero di coppie candidate.
+class DuplicateDetector:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, seed=1):
+        self.threshold = threshold
+        self.hasher = MinHasher(seed=seed)
+        self.entries = []
+        self.signatures = []
+        self.skipped = 0
+
+    def add_class(self, class_data, source):
+        shingle_set = shingles(source)
+        if len(shingle_set) < MIN_SHINGLES:
+            self.skipped += 1
+            return
+        entry = {"name": class_data.get("name", "Unknown")}
+        if "path" in class_data:
+            entry["path"] = class_data["path"]
+        self.entries.append(entry)
+        self.signatures.append(self.hasher.signature(shingle_set))
+
+    def candidate_pairs(self):
+        pairs = set()
+        for band in range(BANDS):
+            start = band * ROWS_PER_BAND
+            buckets = defaultdict(list)
+            for index, signature in enumerate(self.signatures):
+                buckets[signature[start:start + ROWS_PER_BAND]].append(index)
+            for members in buckets.values():
+                for position, first in enumerate(members):
+                    for second in members[position + 1:]:
+                        pairs.add((first, second))
+        return pairs
+
+    # Coppie sopra soglia raggruppate in cluster (union-find)
+    def clusters(self):
+        parent = list(range(len(self.entries)))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        similar_pairs = []
+        for first, second in sorted(self.candidate_pairs()):
+            similarity = estimated_similarity(self.signatures[first], self.signatures[second])
+            if similarity >= self.threshold:
+                similar_pairs.append((first, second, similarity))
+                parent[find(first)] = find(second)
+
+        groups = defaultdict(list)
+        lowest = defaultdict(lambda: 1.0)
+        for first, second, similarity in similar_pairs:
+            root = find(first)
+            lowest[root] = min(lowest[root], similarity)
+        for index in range(len(self.entries)):
+            root = find(index)
+            if root in lowest:
+                groups[root].append(index)
+
+        clusters = [
+            {
+                "size": len(members),
+                "min_similarity": round(lowest[root], 3),
+                "classes": [self.entries[index] for index in members],
+            }
+            for root, members in groups.items()
+        ]
+        clusters.sort(key=lambda cluster: (-cluster["size"], -cluster["min_similarity"]))
+        return clusters
+
+    def report(self):
+        clusters = self.clusters()
+        return {
+            "threshold": self.threshold,
+            "classes": len(self.entries),
+            "skipped_small_classes": self.skipped,
+            "clusters": clusters,
+        }
+
+    def write_report(self, path=duplicates_file):
+        report = self.report()
+        with open(path, "w") as file:
+            json.dump(report, file, indent=4)
+        return report
+
+
+# Integrazione in score_calculator (--duplicates): le firme si calcolano
+# mentre il codice è ancora nel risultato, i cluster a fine elaborazione
+class DuplicateReport:
+    def __init__(self, path=duplicates_file, threshold=DEFAULT_THRESHOLD):
+        self.path = path
+        self.detector = DuplicateDetector(threshold)
+
+    def annotate(self, result):
+        self.detector.add_class(result, metrics_source(result))
+
+    def add(self, result):
+        pass
+
+    def close(self):
+        report = self.detector.write_report(self.path)
+        print(f"Classi quasi duplicate: {len(report['clusters'])} cluster, salvati in: {self.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trova classi PHP quasi duplicate con MinHash/LSH")
+    parser.add_argument("--input", default=dataset_file, help="Dataset di input (array JSON o JSONL)")
+    parser.add_argument("--output", default=duplicates_file, help="File JSON con i cluster trovati")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Similarità di Jaccard minima tra due classi")
+    args = parser.parse_args()
+
+    detector = DuplicateDetector(args.threshold)
+    for class_data in iter_dataset(args.input):
+        detector.add_class(class_data, metrics_source(class_data))
+    report = detector.write_report(args.output)
+    print(f"{report['classes']} classi analizzate, {len(report['clusters'])} cluster di quasi duplicati salvati in: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,258 @@
+import argparse
+import hashlib
 import json
-import matplotlib.pyplot as plt
-
-# Percorso del file JSON
-output_file = "/home/fabio/EGI/scored_classes_with_categories.json"
-
-with open("dataset_ai.json", "r") as file:
-    data = json.load(file)
-    print(f"Numero totale di file elaborati: {len(data)}")
-
-
-# Carica i risultati
-with open(output_file, "r") as file:
-    results = json.load(file)
-
-# Distribuzione dei punteggi
-scores = [result["score"] for result in results]
-plt.figure(figsize=(10, 6))
-plt.hist(scores, bins=10, color="skyblue", edgecolor="black")
-plt.title("Distribuzione dei punteggi")
-plt.xlabel("Punteggio")
-plt.ylabel("Numero di classi")
-plt.grid(axis="y", linestyle="--", alpha=0.7)
-plt.savefig("/home/fabio/EGI/score_distribution.png", dpi=300)
-plt.close()
-
-# Percentuale di PFV per categoria
-categories = set(result["category"] for result in results)
-pfv_counts = {category: 0 for category in categories}
-total_counts = {category: 0 for category in categories}
-
-for result in results:
-    category = result["category"]
-    total_counts[category] += 1
-    if result["is_pfv"]:
-        pfv_counts[category] += 1
-
-# Percentuale per categoria
-percentages = {
-    category: (pfv_counts[category] / total_counts[category]) * 100
-    for category in categories
-}
-
-# Grafico a barre
-plt.figure(figsize=(12, 6))
-plt.bar(percentages.keys(), percentages.values(), color="green", alpha=0.7)
-plt.title("Percentuale di PFV per categoria")
-plt.xlabel("Categoria")
-plt.ylabel("Percentuale di PFV")
-plt.xticks(rotation=45, ha="right")
-plt.grid(axis="y", linestyle="--", alpha=0.7)
-plt.tight_layout()
-plt.savefig("/home/fabio/EGI/pfv_percentage_by_category.png", dpi=300)
-plt.close()
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from class_scanner import iter_dataset
+from score_history import history_file, load_history
+from score_summary import HISTOGRAM_BINS, load_summary, summary_file
+
+# Hash degli aggregati dell'ultimo rendering, nella cartella dei grafici
+chart_hash_file = ".chart_hash"
+
+# Formati e risoluzione di default
+DEFAULT_FORMATS = ("png",)
+DEFAULT_DPI = 300
+
+
+# Funzione per calcolare gli aggregati direttamente da un file di risultati
+# (array JSON o JSONL), quando il riepilogo non è disponibile. Le colonne
+# vengono lette in streaming e aggregate con NumPy in un'unica passata.
+def aggregate_results(path):
+    scores, categories, pfv = [], [], []
+    for result in iter_dataset(path):
+        scores.append(result["score"])
+        categories.append(result["category"])
+        pfv.append(bool(result["is_pfv"]))
+    scores = np.array(scores, dtype=np.int64)
+    names, codes = np.unique(np.array(categories, dtype=str), return_inverse=True)
+    pfv = np.array(pfv, dtype=np.bool_)
+
+    totals = np.bincount(codes, minlength=len(names))
+    pfv_counts = np.bincount(codes, weights=pfv, minlength=len(names)).astype(np.int64)
+    values, value_counts = np.unique(scores, return_counts=True)
+    if len(scores):
+        counts, edges = np.histogram(scores, bins=HISTOGRAM_BINS)
+        histogram = {"edges": edges.tolist(), "counts": counts.tolist()}
+    else:
+        histogram = {"edges": [], "counts": []}
+    return {
+        "classes": int(len(scores)),
+        "pfv": int(pfv.sum()),
+        "score_counts": {str(value): int(count) for value, count in zip(values.tolist(), value_counts.tolist())},
+        "histogram": histogram,
+        "categories": {
+            str(name): {"total": int(total), "pfv": int(count)}
+            for name, total, count in zip(names, totals, pfv_counts)
+        },
+    }
+
+
+# Funzioni di disegno: una per grafico, eseguite nei processi worker.
+# Ognuna riceve solo gli aggregati che le servono.
+def render_score_distribution(histogram, paths, dpi):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    # Un'elaborazione senza classi ha un istogramma vuoto: grafico senza barre
+    if histogram["edges"]:
+        plt.stairs(histogram["counts"], histogram["edges"], fill=True, color="skyblue", edgecolor="black")
+    plt.title("Distribuzione dei punteggi")
+    plt.xlabel("Punteggio")
+    plt.ylabel("Numero di classi")
+    plt.grid(axis="y", linestyle="--", alpha=0.7)
+    for path in paths:
+        plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+def render_pfv_percentage(categories, paths, dpi):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    names = list(categories)
+    totals = np.array([categories[name]["total"] for name in names], dtype=np.float64)
+    pfv_counts = np.array([categories[name]["pfv"] for name in names], dtype=np.float64)
+    percentages = np.divide(pfv_counts * 100, totals, out=np.zeros_like(totals), where=totals > 0)
+
+    plt.figure(figsize=(12, 6))
+    plt.bar(names, percentages, color="green", alpha=0.7)
+    plt.title("Percentuale di PFV per categoria")
+    plt.xlabel("Categoria")
+    plt.ylabel("Percentuale di PFV")
+    plt.xticks(rotation=45, ha="right")
+    plt.grid(axis="y", linestyle="--", alpha=0.7)
+    plt.tight_layout()
+    for path in paths:
+        plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+# Grafici di tendenza: ricevono solo le colonne estratte dallo storico
+def render_pfv_trend(trend, paths, dpi):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    dates = np.array(trend["dates"], dtype="datetime64[s]")
+    plt.figure(figsize=(12, 6))
+    for category, rates in trend["pfv_rate"].items():
+        plt.plot(dates, np.array(rates, dtype=np.float64) * 100, marker=".", label=category)
+    plt.title("Percentuale di PFV per categoria nel tempo")
+    plt.xlabel("Data")
+    plt.ylabel("Percentuale di PFV")
+    plt.legend()
+    plt.grid(axis="y", linestyle="--", alpha=0.7)
+    plt.gcf().autofmt_xdate()
+    plt.tight_layout()
+    for path in paths:
+        plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+def render_class_trend(trend, paths, dpi):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    dates = np.array(trend["dates"], dtype="datetime64[s]")
+    plt.figure(figsize=(12, 6))
+    plt.plot(dates, trend["classes"], color="skyblue", marker=".", label="Classi")
+    plt.plot(dates, trend["pfv"], color="green", marker=".", label="PFV")
+    plt.title("Classi e PFV nel tempo")
+    plt.xlabel("Data")
+    plt.ylabel("Numero di classi")
+    plt.legend()
+    plt.grid(axis="y", linestyle="--", alpha=0.7)
+    plt.gcf().autofmt_xdate()
+    plt.tight_layout()
+    for path in paths:
+        plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+# Funzione per estrarre dallo storico le serie dei grafici di tendenza.
+# Una categoria assente in un'elaborazione vale NaN (linea interrotta).
+def history_trend(history):
+    categories = sorted({category for record in history for category in record["pfv_rate"]})
+    return {
+        # datetime64 non accetta il fuso orario: le date sono già in UTC
+        "dates": [record["date"].split("+")[0] for record in history],
+        "classes": [record["classes"] for record in history],
+        "pfv": [record["pfv"] for record in history],
+        "pfv_rate": {
+            category: [record["pfv_rate"].get(category, float("nan")) for record in history]
+            for category in categories
+        },
+    }
+
+
+# Grafici prodotti: nome del file, funzione di disegno e dati dal riepilogo
+# (e dallo storico, se disponibile)
+def chart_jobs(summary=None, history=None):
+    jobs = []
+    if summary is not None:
+        jobs.append(("score_distribution", render_score_distribution, summary["histogram"]))
+        jobs.append(("pfv_percentage_by_category", render_pfv_percentage, summary["categories"]))
+    if history:
+        trend = history_trend(history)
+        jobs.append(("pfv_trend_by_category", render_pfv_trend, trend))
+        jobs.append(("class_trend", render_class_trend, trend))
+    return jobs
+
+
+# Funzione per calcolare l'impronta di tutto ciò che determina i grafici:
+# aggregati, formati e risoluzione
+def charts_hash(jobs, formats, dpi):
+    payload = json.dumps(
+        {"charts": {name: data for name, _render, data in jobs}, "formats": list(formats), "dpi": dpi},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Funzione per disegnare i grafici in parallelo, un processo per grafico.
+# Se gli aggregati coincidono con quelli dell'ultimo rendering e i file
+# esistono ancora, non viene disegnato nulla; lo stesso senza grafici (es.
+# storico vuoto). Restituisce i file scritti.
+def render_charts(jobs, output_dir=".", formats=DEFAULT_FORMATS, dpi=DEFAULT_DPI, workers=None, force=False):
+    if not jobs:
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = {
+        name: [os.path.join(output_dir, f"{name}.{extension}") for extension in formats]
+        for name, _render, _data in jobs
+    }
+    digest = charts_hash(jobs, formats, dpi)
+    hash_path = os.path.join(output_dir, chart_hash_file)
+    if not force and os.path.exists(hash_path):
+        with open(hash_path, "r") as file:
+            previous = file.read().strip()
+        if previous == digest and all(os.path.exists(path) for paths in outputs.values() for path in paths):
+            return []
+
+    with ProcessPoolExecutor(max_workers=workers or len(jobs)) as executor:
+        futures = [executor.submit(render, data, outputs[name], dpi) for name, render, data in jobs]
+        for future in futures:
+            future.result()
+
+    with open(hash_path, "w") as file:
+        file.write(digest)
+    return [path for paths in outputs.values() for path in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grafici dei punteggi calcolati da score_calculator.py")
+    parser.add_argument("--summary", default=summary_file, help=f"Riepilogo da disegnare (default: {summary_file})")
+    parser.add_argument("--results", default=None,
+                        help="Calcola gli aggregati da un file di risultati invece che dal riepilogo")
+    parser.add_argument("--history", nargs="?", const=history_file, default=None,
+                        help=f"Aggiunge i grafici di tendenza dallo storico (default: {history_file})")
+    parser.add_argument("--trends-only", action="store_true",
+                        help="Disegna solo i grafici di tendenza, senza leggere il riepilogo")
+    parser.add_argument("--output-dir", default=".", help="Cartella dei grafici")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS),
+                        help="Formati separati da virgola, es. png,svg,pdf")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    parser.add_argument("--workers", type=int, default=None, help="Processi di disegno (default: uno per grafico)")
+    parser.add_argument("--force", action="store_true", help="Ridisegna anche se gli aggregati non sono cambiati")
+    args = parser.parse_args()
+
+    if args.trends_only and not args.history:
+        parser.error("--trends-only richiede --history")
+    if args.history and not os.path.exists(args.history):
+        parser.error(f"storico non trovato: {args.history}")
+
+    summary = None
+    if not args.trends_only:
+        summary = aggregate_results(args.results) if args.results else load_summary(args.summary)
+        print(f"Numero totale di file elaborati: {summary['classes']}")
+    history = None
+    if args.history:
+        history = load_history(args.history)
+        print(f"Elaborazioni nello storico: {len(history)}")
+
+    formats = tuple(extension.strip().lstrip(".") for extension in args.formats.split(",") if extension.strip())
+    jobs = chart_jobs(summary, history)
+    if not jobs:
+        print("Nessun grafico da disegnare")
+        return
+    written = render_charts(jobs, args.output_dir, formats, args.dpi, args.workers, args.force)
+    if written:
+        print(f"Grafici salvati: {', '.join(written)}")
+    else:
+        print(f"Aggregati invariati: grafici in {args.output_dir} già aggiornati")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import heapq
+import json
+
+from php_scanner import MEMBER_ACCESS, iter_tokens, metrics_source
+
+# Classifica dei metodi più complessi (opzionale, --hotspots di score_calculator)
+hotspots_file = "method_hotspots.json"
+
+# Metodi riportati per ogni classe nel risultato
+METHODS_PER_CLASS = 5
+
+# Parole chiave che aggiungono un ramo al grafo di controllo del metodo
+DECISION_KEYWORDS = frozenset(("if", "elseif", "for", "foreach", "while", "case", "catch", "and", "or", "xor"))
+
+# Operatori che aggiungono un ramo: && e || (cortocircuito) e ?? (null coalescing).
+# Il ternario "?" (anche nella forma breve "?:") è gestito a parte.
+DECISION_OPERATORS = frozenset(("&&", "||", "??"))
+
+# Token dopo i quali "?" introduce un tipo nullable e non un ternario
+NULLABLE_CONTEXT = frozenset(("(", ",", ":", "|", "{", ";"))
+
+
+# Funzione per calcolare la complessità ciclomatica di ogni metodo del
+# sorgente in una sola scansione dei token. Restituisce tuple
+# (nome, complessità, inizio, fine) nell'ordine in cui i metodi compaiono.
+# Le closure e le funzioni anonime contano nel metodo che le contiene;
+# i metodi astratti e quelli delle interfacce (senza corpo) vengono ignorati.
+def method_complexities(source):
+    methods = []
+    depth = 0
+    open_methods = []  # [nome, complessità, inizio, profondità di apertura]
+    pending = None  # metodo dichiarato in attesa della graffa di apertura
+    previous = None
+    tokens = iter_tokens(source)
+    for kind, text, start, end in tokens:
+        if kind == "name" and previous not in MEMBER_ACCESS:
+            keyword = text.lower()
+            if keyword == "function":
+                name_token = next(tokens, None)
+                if name_token is not None and name_token[1] == "&":
+                    name_token = next(tokens, None)
+                if name_token is not None and name_token[0] == "name":
+                    pending = [name_token[1], 1, start, None]
+                    text = name_token[1]
+                elif name_token is not None:
+                    # Closure: il token successivo è "(", resta nel metodo corrente
+                    text = name_token[1]
+            elif keyword in DECISION_KEYWORDS and open_methods:
+                open_methods[-1][1] += 1
+        elif kind == "op":
+            if text == "{":
+                if pending is not None:
+                    pending[3] = depth
+                    open_methods.append(pending)
+                    pending = None
+                depth += 1
+            elif text == "}":
+                depth -= 1
+                if open_methods and open_methods[-1][3] == depth:
+                    name, complexity, method_start, _depth = open_methods.pop()
+                    methods.append((name, complexity, method_start, end))
+            elif text == ";" and pending is not None:
+                pending = None
+            elif open_methods and pending is None:
+                if text in DECISION_OPERATORS:
+                    open_methods[-1][1] += 1
+                elif text == "?" and previous not in NULLABLE_CONTEXT:
+                    open_methods[-1][1] += 1
+        previous = text
+    methods.sort(key=lambda method: method[2])
+    return methods
+
+
+# Classifica repo-wide dei metodi più complessi: un min-heap di dimensione
+# fissa, così la memoria resta O(N) qualunque sia il numero di metodi.
+class HotspotRanking:
+    def __init__(self, size):
+        self.size = size
+        self._heap = []
+        self._sequence = 0
+
+    def add(self, complexity, entry):
+        # Il contatore rende stabile l'ordine a parità di complessità
+        self._sequence += 1
+        item = (complexity, -self._sequence, entry)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def top(self):
+        return [entry for _complexity, _sequence, entry in sorted(self._heap, reverse=True)]
+
+
+# Analisi per metodo integrata in score_calculator (--hotspots N):
+# - annotate() aggiunge al risultato i metodi più complessi della classe
+#   ("methods", da mostrare) e la complessità di tutti i suoi metodi
+#   ("method_complexities", coppie [nome, complessità]);
+# - add()/close() raccolgono i risultati finali e scrivono la classifica
+#   dei N metodi peggiori dell'intero repository. Ogni classe contribuisce
+#   con tutti i suoi metodi, letti dal risultato, così la classifica resta
+#   corretta anche dopo un aggiornamento incrementale (--since).
+class MethodHotspots:
+    def __init__(self, size, path=hotspots_file, per_class=METHODS_PER_CLASS):
+        self.path = path
+        self.per_class = per_class
+        self.ranking = HotspotRanking(size)
+        self.methods = 0
+
+    def annotate(self, result):
+        methods = method_complexities(metrics_source(result))
+        worst = heapq.nlargest(self.per_class, methods, key=lambda method: method[1])
+        result["max_method_complexity"] = worst[0][1] if worst else 0
+        result["methods"] = [{"name": name, "complexity": complexity} for name, complexity, _start, _end in worst]
+        result["method_complexities"] = [[name, complexity] for name, complexity, _start, _end in methods]
+
+    def add(self, result):
+        if "method_complexities" in result:
+            methods = result["method_complexities"]
+        else:
+            # Risultati scritti prima di "method_complexities": solo i metodi mostrati
+            methods = [(method["name"], method["complexity"]) for method in result.get("methods", ())]
+        for name, complexity in methods:
+            self.methods += 1
+            entry = {"class": result["name"], "method": name, "complexity": complexity}
+            if "path" in result:
+                entry["path"] = result["path"]
+            self.ranking.add(complexity, entry)
+
+    def close(self):
+        with open(self.path, "w") as file:
+            json.dump(self.ranking.top(), file, indent=4)
+        print(f"Metodi più complessi ({self.ranking.size} su {self.methods}) salvati in: {self.path}")
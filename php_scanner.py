@@ -0,0 +1,190 @@
+import re
+
+# Frammenti comuni agli scanner: commenti, heredoc, stringhe e identificatori.
+# Commenti e stringhe sono scritti come [^x]*(?:...[^x]*)* così il motore
+# consuma di un colpo le sequenze di caratteri ordinari.
+COMMENT = r"//[^\n]*|\#(?!\[)[^\n]*|/\*[^*]*(?:\*(?!/)[^*]*)*(?:\*/|\Z)"
+HEREDOC = r"<<<[ \t]*(?P<quote>[\"']?)(?P<label>[A-Za-z_]\w*)(?P=quote)\r?\n.*?^[ \t]*(?P=label)\b"
+STRING = r"""'[^'\\]*(?:\\.[^'\\]*)*'|"[^"\\]*(?:\\.[^"\\]*)*"|`[^`\\]*(?:\\.[^`\\]*)*`"""
+IDENTIFIER = r"[A-Za-z_\x80-\uffff][\w\x80-\uffff]*"
+
+# Scanner PHP a passata singola: una sola espressione regolare riconosce
+# commenti, stringhe, heredoc, variabili, identificatori (anche qualificati,
+# es. App\Models\User) e operatori, così
+# le parole chiave dentro stringhe e commenti non vengono conteggiate e
+# "elseif", "format" o "classList" non vengono scambiati per "if", "for" o "class".
+TOKEN_PATTERN = re.compile(
+    rf"""
+    (?P<comment>{COMMENT})
+    |(?P<heredoc>{HEREDOC})
+    |(?P<string>{STRING})
+    |(?P<variable>\${IDENTIFIER})
+    |(?P<name>\\?{IDENTIFIER}(?:\\{IDENTIFIER})*)
+    |(?P<op>\?\?=|\?\?|\?->|&&|\|\||::|->|=>|[{{}}()\[\];,?:|&])
+    """,
+    re.VERBOSE | re.DOTALL | re.MULTILINE,
+)
+
+# Token dopo i quali un identificatore è un membro e non una parola chiave
+# (es. Foo::class, $this->if)
+MEMBER_ACCESS = frozenset(("::", "->", "?->"))
+
+# Parole chiave conteggiate da scan_metrics, con la metrica a cui contribuiscono
+METRIC_KEYWORDS = {
+    "if": "complexity",
+    "elseif": "complexity",
+    "for": "complexity",
+    "foreach": "complexity",
+    "while": "complexity",
+    "class": "srp",
+    "extends": "ocp",
+    "implements": "ocp",
+    "interface": "isp",
+    "__construct": "dip",
+}
+
+
+# Funzione per scorrere i token significativi del sorgente.
+# Restituisce tuple (tipo, testo, inizio, fine); i commenti vengono saltati,
+# le stringhe (e gli heredoc) restano come token di tipo "string".
+def iter_tokens(source):
+    for match in TOKEN_PATTERN.finditer(source):
+        kind = match.lastgroup
+        if kind == "comment":
+            continue
+        if kind == "heredoc":
+            kind = "string"
+        yield kind, match.group(), match.start(), match.end()
+
+
+# Scanner delle sole metriche, in due passate invece di un token per volta:
+# - SKIPPED_PATTERN sostituisce commenti, stringhe e heredoc con uno spazio
+#   (tutte le alternative iniziano con un carattere fisso, quindi il motore
+#   salta da solo il resto del codice);
+# - KEYWORD_PATTERN cerca le parole chiave nel testo rimasto, in minuscolo.
+# Python esamina solo le parole chiave trovate (poche per classe) per
+# scartare quelle dentro un identificatore (classList, $if, App\If) o dopo
+# un accesso a un membro (Foo::class, $this->if), come fa TOKEN_PATTERN.
+SKIPPED_PATTERN = re.compile(rf"{COMMENT}|{HEREDOC}|{STRING}", re.DOTALL | re.MULTILINE)
+KEYWORD_PATTERN = re.compile(
+    rf"(?:{'|'.join(sorted(METRIC_KEYWORDS, key=len, reverse=True))})(?![\w\x80-\uffff]|\\[a-z_\x80-\uffff])"
+)
+IDENTIFIER_CHARACTER = re.compile(r"[\w\x80-\uffff$\\]")
+
+
+# Funzione per calcolare le metriche con le due passate descritte sopra
+def scan_metrics(source):
+    metrics = {"complexity": 0, "srp": 0, "ocp": 0, "isp": 0, "dip": 0}
+    code = SKIPPED_PATTERN.sub(" ", source).lower()
+    for match in KEYWORD_PATTERN.finditer(code):
+        start = match.start()
+        if start and IDENTIFIER_CHARACTER.match(code, start - 1):
+            continue
+        before = start
+        while before and code[before - 1].isspace():
+            before -= 1
+        if code[max(before - 2, 0):before] in MEMBER_ACCESS:
+            continue
+        metrics[METRIC_KEYWORDS[match.group()]] += 1
+    return metrics
+
+
+# Dichiarazioni di tipo riconosciute e modificatori che possono precederle
+DECLARATION_KEYWORDS = frozenset(("class", "interface", "trait"))
+DECLARATION_MODIFIERS = frozenset(("abstract", "final", "readonly"))
+
+# Parole chiave che seguono "class" in una classe anonima e che quindi non
+# possono esserne il nome
+ANONYMOUS_CLASS_FOLLOWERS = frozenset(("extends", "implements"))
+
+
+# Funzione per individuare il corpo di ogni classe, interfaccia o trait.
+# Restituisce tuple (tipo, nome, inizio, fine) dove l'intervallo va dal primo
+# modificatore alla graffa di chiusura inclusa. Se il sorgente è in bytes gli
+# offset sono in byte (il testo viene letto come latin-1, un carattere per
+# byte); se è una stringa sono in caratteri. Le graffe dentro stringhe e
+# commenti non contano; le classi anonime (new class extends Foo { ... })
+# non sono dichiarazioni e restano parte della classe che le contiene, o di
+# nessuna classe se sono fuori da ogni classe (es. le migrazioni di Laravel).
+def extract_class_spans(source):
+    from_bytes = isinstance(source, bytes)
+    if from_bytes:
+        source = source.decode("latin-1")
+
+    spans = []
+    depth = 0
+    current = None  # (tipo, nome, inizio, profondità di apertura)
+    modifier_start = None
+    pending = None  # dichiarazione in attesa della graffa di apertura
+    previous = None
+    anonymous = False  # dopo "new" ed eventuali modificatori (new readonly class)
+    tokens = iter_tokens(source)
+    for kind, text, start, end in tokens:
+        if kind == "name" and current is None and pending is None and previous not in MEMBER_ACCESS:
+            keyword = text.lower()
+            if keyword in DECLARATION_MODIFIERS:
+                if modifier_start is None:
+                    modifier_start = start
+            elif keyword in DECLARATION_KEYWORDS and anonymous:
+                modifier_start = None
+            elif keyword in DECLARATION_KEYWORDS:
+                name_token = next(tokens, None)
+                if (name_token is not None and name_token[0] == "name"
+                        and name_token[1].lower() not in ANONYMOUS_CLASS_FOLLOWERS):
+                    decl_start = modifier_start if modifier_start is not None else start
+                    name = name_token[1]
+                    if from_bytes:
+                        name = name.encode("latin-1").decode("utf-8", errors="replace")
+                    pending = (keyword, name, decl_start)
+                    text = name_token[1]
+                modifier_start = None
+            else:
+                modifier_start = None
+        elif kind != "name":
+            modifier_start = None
+        if kind == "name" and text.lower() == "new":
+            anonymous = True
+        elif not (kind == "name" and text.lower() in DECLARATION_MODIFIERS):
+            anonymous = False
+
+        if text == "{" and kind == "op":
+            if pending is not None:
+                current = pending + (depth,)
+                pending = None
+            depth += 1
+        elif text == "}" and kind == "op":
+            depth -= 1
+            if current is not None and depth == current[3]:
+                spans.append((current[0], current[1], current[2], end))
+                current = None
+        elif text == ";" and kind == "op" and pending is not None and current is None:
+            pending = None
+        previous = text
+    return spans
+
+
+# Ultimo sorgente analizzato da class_source: le classi dello stesso file sono
+# consecutive nel dataset, così il file viene scandito una volta sola
+_last_spans = (None, ())
+
+
+# Funzione per ricavare il solo corpo della classe indicata dal sorgente
+# dell'intero file; se la classe non viene trovata restituisce il sorgente intero
+def class_source(source, name):
+    global _last_spans
+    if _last_spans[0] != source:
+        _last_spans = (source, extract_class_spans(source))
+    for _kind, span_name, start, end in _last_spans[1]:
+        if span_name == name:
+            return source[start:end]
+    return source
+
+
+# Funzione per ottenere il codice su cui calcolare le metriche: le voci con
+# "span" contengono già il solo corpo della classe, quelle dei dataset
+# precedenti contengono l'intero file e vanno ristrette alla classe indicata
+def metrics_source(class_data):
+    code = class_data.get("code", "")
+    if "span" in class_data:
+        return code
+    return class_source(code, class_data.get("name", ""))
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import sqlite3
+
+# File SQLite di default per la cache incrementale delle metriche
+cache_file = ".score_cache.sqlite"
+
+# Numero di voci accumulate in memoria prima di scriverle su disco
+FLUSH_EVERY = 10000
+
+
+# Cache persistente dei risultati per classe, indicizzata sull'hash del codice.
+# Una classe il cui codice non è cambiato dall'ultima esecuzione non viene
+# ricalcolata; le voci non viste durante l'esecuzione vengono rimosse da prune().
+class ScoreCache:
+    def __init__(self, path=cache_file, version=1):
+        self.path = path
+        self.version = str(version)
+        self.connection = sqlite3.connect(path)
+        self.hits = 0
+        self.misses = 0
+        self._seen = []
+        self._pending = []
+        self._create_schema()
+
+    def _create_schema(self):
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS class_scores (
+                code_hash TEXT NOT NULL,
+                name TEXT NOT NULL,
+                metrics TEXT NOT NULL,
+                category TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                is_pfv INTEGER NOT NULL,
+                PRIMARY KEY (code_hash, name)
+            ) WITHOUT ROWID
+            """
+        )
+
+        # Se il calcolo delle metriche è cambiato, le voci salvate non valgono più
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'metrics_version'").fetchone()
+        if row is None or row[0] != self.version:
+            cursor.execute("DELETE FROM class_scores")
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('metrics_version', ?)", (self.version,))
+        cursor.execute("CREATE TEMP TABLE seen (code_hash TEXT NOT NULL, name TEXT NOT NULL, PRIMARY KEY (code_hash, name)) WITHOUT ROWID")
+        self.connection.commit()
+
+    # Chiave della classe: hash del codice più il nome (la categoria dipende dal nome)
+    @staticmethod
+    def key(class_data):
+        code = class_data.get("code", "")
+        digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        return digest, class_data.get("name", "Unknown")
+
+    # Restituisce (category, metrics, score, is_pfv) oppure None se non in cache
+    def get(self, key):
+        self._seen.append(key)
+        if len(self._seen) >= FLUSH_EVERY:
+            self._flush()
+        row = self.connection.execute(
+            "SELECT metrics, category, score, is_pfv FROM class_scores WHERE code_hash = ? AND name = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        metrics, category, score, pfv_flag = row
+        return category, json.loads(metrics), score, bool(pfv_flag)
+
+    def put(self, key, evaluation):
+        category, metrics, score, pfv_flag = evaluation
+        self._pending.append((key[0], key[1], json.dumps(metrics), category, score, int(pfv_flag)))
+        if len(self._pending) >= FLUSH_EVERY:
+            self._flush()
+
+    # Salva le nuove voci ed elimina quelle delle classi non più presenti
+    def prune(self):
+        self._flush()
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "DELETE FROM class_scores WHERE NOT EXISTS "
+            "(SELECT 1 FROM seen WHERE seen.code_hash = class_scores.code_hash AND seen.name = class_scores.name)"
+        )
+        evicted = cursor.rowcount
+        cursor.execute("DELETE FROM seen")
+        self.connection.commit()
+        return evicted
+
+    def _flush(self):
+        cursor = self.connection.cursor()
+        if self._pending:
+            cursor.executemany("INSERT OR REPLACE INTO class_scores VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+            self._pending = []
+        if self._seen:
+            cursor.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?)", self._seen)
+            self._seen = []
+        self.connection.commit()
+
+    def close(self):
+        self._flush()
+        self.connection.close()
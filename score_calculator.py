@@ -1,4 +1,25 @@
+import argparse
 import json
+import os
+import subprocess
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
+
+from class_scanner import input_dir, iter_classes, iter_dataset, iter_file_classes
+from code_blobs import BlobStore, blob_dir
+from columnar_output import columnar_file
+from dependency_graph import dependencies_file
+from duplicate_detector import duplicates_file
+from method_complexity import hotspots_file
+from php_scanner import metrics_source, scan_metrics
+from score_cache import ScoreCache, cache_file
+from score_history import history_file
+from score_summary import summary_file
+from scores_db import database_file
+from scoring_profile import ProgressReporter, StageProfiler, profile_file
 
 # File di input (dataset iniziale)
 input_file = "dataset_ai.json"
@@ -6,20 +27,22 @@ input_file = "dataset_ai.json"
 # File di output (con metriche e categorie aggiornate)
 output_file = "scored_classes_with_categories.json"
 
-# Funzione per calcolare metriche mancanti (se non già presenti)
+# File di output in modalità streaming (un risultato JSON per riga)
+stream_output_file = "scored_classes_with_categories.jsonl"
+
+# Numero di classi inviate a ogni worker in modalità parallela
+WORKER_CHUNK_SIZE = 256
+
+# Versione del calcolo metriche: va incrementata a ogni modifica di
+# calculate_metrics, così la cache incrementale viene invalidata
+METRICS_VERSION = 4
+
+# Funzione per calcolare metriche mancanti (se non già presenti).
+# Due passate con espressioni regolari (scan_metrics): stringhe e commenti
+# vengono tolti e si contano solo le parole chiave vere (if/elseif/for/
+# foreach/while, class, extends/implements, interface, __construct).
 def calculate_metrics(class_code):
-    complexity = class_code.count("if") + class_code.count("for") + class_code.count("while")
-    srp = class_code.count("class")
-    ocp = class_code.count("extends") + class_code.count("implements")
-    isp = class_code.count("interface")
-    dip = class_code.count("__construct")
-    return {
-        "complexity": complexity,
-        "srp": srp,
-        "ocp": ocp,
-        "isp": isp,
-        "dip": dip,
-    }
+    return scan_metrics(class_code)
 
 # Funzione per categorizzare le classi
 def categorize_class(class_data):
@@ -56,39 +79,434 @@ def is_pfv(score, category):
     threshold = 7 if category != "simple_service" else 5
     return score >= threshold
 
-# Caricamento del dataset
-with open(input_file, "r") as file:
-    dataset = json.load(file)
-
-# Elaborazione e aggiunta del campo "code"
-results = []
-for class_data in dataset:
-    name = class_data.get("name", "Unknown")
-    code = class_data.get("code", "")  # Recupera il codice della classe
+# Funzione per valutare una classe: categoria, metriche, punteggio e flag PFV.
+# Con un dizionario `timings` accumula il tempo speso in ogni fase (--profile).
+def evaluate_class(class_data, timings=None):
+    if timings is not None:
+        started = perf_counter()
     metrics = class_data.get("metrics", None)
 
     # Calcola le metriche se mancanti
     if not metrics:
-        metrics = calculate_metrics(code)
+        metrics = calculate_metrics(metrics_source(class_data))
 
+    if timings is not None:
+        categorized = perf_counter()
+        timings["metrics"] += categorized - started
     category = categorize_class(class_data)
+
+    if timings is not None:
+        scored = perf_counter()
+        timings["categorize"] += scored - categorized
     score = calculate_score({"metrics": metrics}, category)
     pfv_flag = is_pfv(score, category)
 
+    if timings is not None:
+        timings["score"] += perf_counter() - scored
+    return category, metrics, score, pfv_flag
+
+# Funzione per costruire il risultato di una classe già valutata
+def build_result(class_data, evaluation):
+    category, metrics, score, pfv_flag = evaluation
+
     # Crea il risultato con tutti i campi necessari
-    results.append({
-        "name": name,
-        "code": code,  # Inserisce il codice
-        "category": category,
-        "metrics": metrics,
-        "score": score,
-        "is_pfv": pfv_flag,
-    })
-
-    print(f"Classe: {name}, Categoria: {category}, Punteggio: {score}, PFV: {pfv_flag}")
-
-# Scrittura del file aggiornato
-with open(output_file, "w") as file:
-    json.dump(results, file, indent=4)
-
-print(f"File aggiornato salvato in: {output_file}")
+    result = {"name": class_data.get("name", "Unknown")}
+
+    # Percorso e offset servono all'aggiornamento incrementale (--since)
+    if "path" in class_data:
+        result["path"] = class_data["path"]
+        result["span"] = class_data.get("span")
+    result["code"] = class_data.get("code", "")  # Inserisce il codice
+    result["category"] = category
+    result["metrics"] = metrics
+    result["score"] = score
+    result["is_pfv"] = pfv_flag
+    return result
+
+# Funzione per elaborare una singola classe del dataset
+def score_class(class_data):
+    return build_result(class_data, evaluate_class(class_data))
+
+# Funzione eseguita nei processi worker: valuta un blocco di classi e, se
+# richiesto, restituisce anche i tempi per fase
+def _evaluate_chunk(chunk, timed=False):
+    timings = {"metrics": 0.0, "categorize": 0.0, "score": 0.0} if timed else None
+    return [evaluate_class(class_data, timings) for class_data in chunk], timings
+
+# Funzione per eseguire subito un blocco nel processo corrente (modalità
+# seriale o blocco campionato da cProfile), con la stessa interfaccia del pool
+def _evaluate_now(chunk, profiler, sample=False):
+    future = Future()
+    if sample:
+        future.set_result(profiler.run_sampled(_evaluate_chunk, chunk, True))
+    else:
+        future.set_result(_evaluate_chunk(chunk, profiler is not None))
+    return future
+
+# Funzione per recuperare dalla cache le valutazioni di un blocco di classi.
+# Le classi con metriche già presenti nel dataset non passano dalla cache.
+def _lookup_chunk(chunk, cache):
+    keys = [None] * len(chunk)
+    evaluations = [None] * len(chunk)
+    if cache is not None:
+        for index, class_data in enumerate(chunk):
+            if not class_data.get("metrics"):
+                keys[index] = cache.key(class_data)
+                evaluations[index] = cache.get(keys[index])
+    return keys, evaluations
+
+# Funzione per elaborare le classi, in serie o con un pool di processi.
+# I risultati escono sempre nell'ordine del dataset: i blocchi in volo sono
+# al massimo due per worker, quindi anche lo streaming resta a memoria costante.
+# Con una cache, solo le classi il cui codice è cambiato vengono ricalcolate.
+def score_classes(dataset, workers=1, chunk_size=WORKER_CHUNK_SIZE, cache=None, profiler=None):
+    iterator = iter(dataset)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    in_flight = workers * 2 if executor is not None else 1
+    try:
+        pending = deque()
+        while True:
+            while len(pending) < in_flight:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                if profiler is not None:
+                    profiler.count_chunk(chunk)
+                    with profiler.timed("cache"):
+                        keys, evaluations = _lookup_chunk(chunk, cache)
+                else:
+                    keys, evaluations = _lookup_chunk(chunk, cache)
+
+                misses = [class_data for class_data, evaluation in zip(chunk, evaluations) if evaluation is None]
+                sample = bool(misses) and profiler is not None and profiler.should_sample()
+                if not misses:
+                    future = None
+                elif executor is None or sample:
+                    future = _evaluate_now(misses, profiler, sample)
+                else:
+                    future = executor.submit(_evaluate_chunk, misses, profiler is not None)
+                pending.append((chunk, keys, evaluations, future))
+            if not pending:
+                return
+
+            chunk, keys, evaluations, future = pending.popleft()
+            computed, timings = future.result() if future is not None else ((), None)
+            if timings is not None:
+                profiler.add_timings(timings)
+            computed = iter(computed)
+            for class_data, key, evaluation in zip(chunk, keys, evaluations):
+                if evaluation is None:
+                    evaluation = next(computed)
+                    if key is not None:
+                        cache.put(key, evaluation)
+                yield build_result(class_data, evaluation)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+# Funzione per aprire la cache, se richiesta
+def open_cache(path):
+    if not path:
+        return None
+    return ScoreCache(path, version=METRICS_VERSION)
+
+# Funzione per chiudere la cache eliminando le classi non più presenti.
+# Con un'elaborazione parziale (--since) non si elimina nulla: le classi non
+# rielaborate esistono ancora.
+def close_cache(cache, prune=True):
+    if cache is None:
+        return
+    evicted = cache.prune() if prune else 0
+    cache.close()
+    print(f"Cache: {cache.hits} classi riutilizzate, {cache.misses} ricalcolate, {evicted} voci rimosse")
+
+# Opzioni condivise da tutte le modalità di elaborazione
+# Le analisi aggiuntive (annotators) arricchiscono ogni risultato appena
+# calcolato con annotate(), quando il codice è ancora disponibile; le uscite
+# aggiuntive (sinks) ricevono ogni risultato finale con add() e vengono
+# chiuse con close() a fine elaborazione
+class RunOptions:
+    def __init__(self, workers=1, cache=None, blobs=None, profiler=None, progress=None, sinks=(), annotators=()):
+        self.workers = workers
+        self.cache = cache
+        self.blobs = blobs
+        self.profiler = profiler
+        self.progress = progress or ProgressReporter()
+        self.sinks = list(sinks)
+        self.annotators = list(annotators)
+
+    # Passa un risultato finale a tutte le uscite aggiuntive
+    def emit(self, result):
+        for sink in self.sinks:
+            sink.add(result)
+
+    def close_sinks(self):
+        for sink in self.sinks:
+            sink.close()
+
+# Funzione per caricare tutto il dataset in memoria
+def load_dataset(input_path):
+    with open(input_path, "r") as file:
+        return json.load(file)
+
+# Funzione comune a tutte le modalità: calcola i risultati, sostituisce il
+# codice con il riferimento al blob (se richiesto) e aggiorna l'avanzamento
+def process_results(dataset, options):
+    if options.profiler is not None:
+        dataset = options.profiler.timed_iter("load", dataset)
+    results = score_classes(dataset, options.workers, cache=options.cache, profiler=options.profiler)
+    for result in results:
+        for annotator in options.annotators:
+            annotator.annotate(result)
+        if options.blobs is not None:
+            result = options.blobs.externalize(result)
+        options.progress.update(result)
+        yield result
+    options.progress.finish()
+
+# Elaborazione classica: elabora tutto il dataset e scrive un unico array JSON
+def run_batch(dataset, output_path, options):
+    # Elaborazione e aggiunta del campo "code"
+    results = list(process_results(dataset, options))
+
+    with timed_stage(options.profiler, "dump"):
+        write_results(results, output_path, compact=options.blobs is not None)
+        for result in results:
+            options.emit(result)
+    print(f"File aggiornato salvato in: {output_path}")
+
+# Elaborazione in streaming: memoria costante, un risultato JSONL per riga
+def run_stream(dataset, output_path, options):
+    count = 0
+    profiler = options.profiler
+    with open(output_path, "w", encoding="utf-8") as file:
+        for result in process_results(dataset, options):
+            if profiler is not None:
+                started = perf_counter()
+            file.write(json.dumps(result, ensure_ascii=False))
+            file.write("\n")
+            options.emit(result)
+            if profiler is not None:
+                profiler.seconds["dump"] += perf_counter() - started
+            count += 1
+
+    print(f"{count} classi elaborate, risultati salvati in: {output_path}")
+
+# Elaborazione incrementale: rielabora solo i file PHP cambiati rispetto alla
+# revisione indicata e aggiorna i risultati esistenti, togliendo le classi dei
+# file modificati o cancellati e aggiungendo quelle nuove
+def run_since(revision, scan_dir, output_path, jsonl, options, changed=None, deleted=None):
+    if changed is None:
+        changed, deleted = git_changed_files(revision, scan_dir)
+    print(f"File PHP cambiati da {revision}: {len(changed)} modificati/aggiunti, {len(deleted)} cancellati")
+
+    # I nuovi risultati usano la stessa forma di percorso di --scan, come
+    # un'elaborazione completa; i confronti usano i percorsi assoluti
+    paths = sorted(scan_path(path, scan_dir) for path in changed)
+    new_results = list(process_results(iter_file_classes(paths), options))
+
+    # Le classi dei file non toccati restano com'erano
+    stale = changed | deleted
+    results = []
+    removed = 0
+    for result in iter_dataset(output_path):
+        if "path" not in result:
+            raise ValueError(f"{output_path} non contiene i percorsi dei file: serve prima un'elaborazione completa con --scan")
+        if os.path.abspath(result["path"]) in stale:
+            removed += 1
+        else:
+            # Le analisi che dipendono dall'intero repository vanno ricalcolate
+            for annotator in options.annotators:
+                if getattr(annotator, "refresh", False):
+                    annotator.annotate(result)
+            results.append(result)
+    results.extend(new_results)
+
+    # Stesso ordine di un'elaborazione completa: per percorso, poi ordine nel file
+    results.sort(key=lambda result: os.path.abspath(result["path"]))
+    with timed_stage(options.profiler, "dump"):
+        write_results(results, output_path, jsonl=jsonl, compact=options.blobs is not None)
+        for result in results:
+            options.emit(result)
+    print(f"{removed} classi rimosse, {len(new_results)} rielaborate; risultati salvati in: {output_path}")
+
+# Funzione per misurare una fase solo se la profilazione è attiva
+def timed_stage(profiler, stage):
+    if profiler is None:
+        return nullcontext()
+    return profiler.timed(stage)
+
+# Funzione per riportare un percorso assoluto nella forma prodotta da
+# --scan DIR (relativa se DIR è relativa, assoluta altrimenti)
+def scan_path(path, scan_dir):
+    return os.path.join(scan_dir, os.path.relpath(path, os.path.abspath(scan_dir)))
+
+# Funzione per chiedere a git quali file PHP sono cambiati dalla revisione
+# indicata (working tree compreso). git viene eseguito nella cartella
+# analizzata, così funziona da qualunque cartella corrente. Restituisce due
+# insiemi di percorsi assoluti: file esistenti modificati/aggiunti e file cancellati.
+def git_changed_files(revision, directory):
+    root = os.path.abspath(directory)
+    output = subprocess.run(
+        ["git", "-C", root, "diff", "--name-status", "--no-renames", "--relative", "-z", revision, "--", "."],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    fields = output.split("\0")
+    changed, deleted = set(), set()
+    for status, path in zip(fields[0::2], fields[1::2]):
+        if not path.endswith(".php"):
+            continue
+        path = os.path.join(root, os.path.normpath(path))
+        if status == "D":
+            deleted.add(path)
+        else:
+            changed.add(path)
+
+    # I file non ancora tracciati sono anch'essi nuovi
+    untracked = subprocess.run(
+        ["git", "-C", root, "ls-files", "--others", "--exclude-standard", "-z", "--", "."],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    changed.update(os.path.join(root, os.path.normpath(path)) for path in untracked.split("\0") if path.endswith(".php"))
+    return changed, deleted
+
+# Funzione per scrivere i risultati: array JSON oppure JSONL. Senza il codice
+# sorgente l'indentazione raddoppierebbe soltanto le dimensioni, quindi in
+# quel caso si scrive in forma compatta.
+def write_results(results, output_path, jsonl=False, compact=False):
+    with open(output_path, "w", encoding="utf-8") as file:
+        if jsonl:
+            for result in results:
+                file.write(json.dumps(result, ensure_ascii=False))
+                file.write("\n")
+        elif compact:
+            json.dump(results, file, separators=(",", ":"))
+        else:
+            json.dump(results, file, indent=4)
+
+# Funzione per creare le analisi e le uscite aggiuntive richieste da riga di
+# comando. I moduli vengono importati solo se servono (es. NumPy per --columnar).
+# Il riepilogo per i grafici (score_summary) viene scritto sempre.
+def build_extensions(args, output_path, changed_files=None):
+    from score_summary import ScoreSummary
+
+    input_path = args.scan or (input_dir if args.since else args.input)
+    summary = ScoreSummary(args.summary, input_path, output_path)
+    sinks, annotators = [summary], []
+    if args.columnar:
+        from columnar_output import ColumnarWriter
+
+        sinks.append(ColumnarWriter(args.columnar))
+    if args.hotspots:
+        from method_complexity import MethodHotspots
+
+        hotspots = MethodHotspots(args.hotspots, args.hotspots_output)
+        annotators.append(hotspots)
+        sinks.append(hotspots)
+    if args.dependencies:
+        from dependency_graph import DependencyCoupling, DependencyGraph
+
+        # Con --since si aggiorna l'indice esistente solo per i file cambiati
+        if changed_files is not None and os.path.exists(args.dependencies):
+            graph = DependencyGraph.load(args.dependencies)
+            graph.update_files(changed_files)
+        else:
+            graph = DependencyGraph.build(args.scan or input_dir)
+        graph.save(args.dependencies)
+        print(f"Grafo delle dipendenze: {len(graph.classes())} classi, {len(graph.cycles())} cicli, salvato in: {args.dependencies}")
+        annotators.append(DependencyCoupling(graph))
+    if args.duplicates:
+        from duplicate_detector import DuplicateReport
+
+        duplicates = DuplicateReport(args.duplicates, args.duplicates_threshold)
+        annotators.append(duplicates)
+        sinks.append(duplicates)
+    if args.history:
+        from score_history import ScoreHistory
+
+        sinks.append(ScoreHistory(summary, args.history))
+    if args.db:
+        from scores_db import ScoreDatabaseWriter
+
+        sinks.append(ScoreDatabaseWriter(args.db))
+    return sinks, annotators
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcola metriche, categoria e punteggio delle classi PHP")
+    parser.add_argument("--input", default=input_file, help="Dataset di input (array JSON o JSONL)")
+    parser.add_argument("--scan", metavar="DIR", default=None,
+                        help="Estrae le classi direttamente dai sorgenti PHP invece di leggere il dataset")
+    parser.add_argument("--output", default=None, help="File dei risultati")
+    parser.add_argument("--since", metavar="REV", default=None,
+                        help="Rielabora solo i file PHP cambiati da REV e aggiorna i risultati esistenti")
+    parser.add_argument("--stream", action="store_true",
+                        help="Legge il dataset un elemento alla volta e scrive i risultati in JSONL")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Numero di processi per il calcolo (1 = seriale)")
+    parser.add_argument("--cache", nargs="?", const=cache_file, default=None,
+                        help=f"Riusa i risultati delle classi non modificate (default: {cache_file})")
+    parser.add_argument("--blobs", nargs="?", const=blob_dir, default=None,
+                        help=f"Salva il codice una volta per contenuto e nei risultati solo l'hash (default: {blob_dir})")
+    parser.add_argument("--columnar", nargs="?", const=columnar_file, default=None,
+                        help=f"Scrive anche un file colonnare binario: .npz, .arrow o .parquet (default: {columnar_file})")
+    parser.add_argument("--hotspots", type=int, default=0, metavar="N",
+                        help="Calcola la complessità ciclomatica per metodo e salva gli N metodi peggiori del repository")
+    parser.add_argument("--hotspots-output", default=hotspots_file,
+                        help=f"File della classifica dei metodi (default: {hotspots_file})")
+    parser.add_argument("--dependencies", nargs="?", const=dependencies_file, default=None,
+                        help=f"Costruisce il grafo delle dipendenze e aggiunge fan-in/fan-out ai risultati (default: {dependencies_file})")
+    parser.add_argument("--duplicates", nargs="?", const=duplicates_file, default=None,
+                        help=f"Cerca classi quasi duplicate (MinHash/LSH) e salva i cluster (default: {duplicates_file})")
+    parser.add_argument("--duplicates-threshold", type=float, default=0.8,
+                        help="Similarità minima per considerare due classi quasi duplicate")
+    parser.add_argument("--summary", default=summary_file,
+                        help=f"Riepilogo per graph_score_calculator.py (default: {summary_file})")
+    parser.add_argument("--history", nargs="?", const=history_file, default=None,
+                        help=f"Aggiunge gli aggregati dell'elaborazione allo storico per i grafici di tendenza (default: {history_file})")
+    parser.add_argument("--db", nargs="?", const=database_file, default=None,
+                        help=f"Salva i risultati come nuova run nel database SQLite interrogabile con scores_db.py (default: {database_file})")
+    parser.add_argument("--profile", nargs="?", const=profile_file, default=None,
+                        help=f"Misura i tempi di ogni fase e salva un report JSON (default: {profile_file})")
+    parser.add_argument("--profile-sample", type=int, default=0, metavar="N",
+                        help="Con --profile, esegue sotto cProfile un blocco di classi ogni N (0 = disattivato)")
+    parser.add_argument("--progress-interval", type=float, default=1.0,
+                        help="Secondi minimi tra due righe di avanzamento")
+    args = parser.parse_args()
+    if args.since and args.duplicates:
+        parser.error("--duplicates richiede il codice di tutte le classi: non è compatibile con --since")
+
+    profiler = StageProfiler(args.profile_sample) if args.profile else None
+    changed = deleted = None
+    if args.since:
+        changed, deleted = git_changed_files(args.since, args.scan or input_dir)
+    output_path = args.output or (stream_output_file if args.stream else output_file)
+    sinks, annotators = build_extensions(args, output_path, changed | deleted if args.since else None)
+    options = RunOptions(
+        workers=args.workers,
+        cache=open_cache(args.cache),
+        blobs=BlobStore(args.blobs) if args.blobs else None,
+        profiler=profiler,
+        progress=ProgressReporter(args.progress_interval),
+        sinks=sinks,
+        annotators=annotators,
+    )
+    if args.since:
+        run_since(args.since, args.scan or input_dir, output_path, args.stream, options, changed, deleted)
+    elif args.stream:
+        dataset = iter_classes(args.scan) if args.scan else iter_dataset(args.input)
+        run_stream(dataset, output_path, options)
+    else:
+        with timed_stage(profiler, "load"):
+            dataset = list(iter_classes(args.scan)) if args.scan else load_dataset(args.input)
+        run_batch(dataset, output_path, options)
+    with timed_stage(profiler, "dump"):
+        options.close_sinks()
+    close_cache(options.cache, prune=not args.since)
+    if options.blobs is not None:
+        print(f"Codice sorgente: {options.blobs.written} nuovi blob in {options.blobs.directory}")
+    if profiler is not None:
+        report = profiler.write_report(args.profile, args.workers)
+        print(f"Profilo: {report['classes']} classi, {report['classes_per_sec']} classi/s, report salvato in: {args.profile}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import sys
+
+from class_scanner import iter_dataset
+
+# Report delle differenze tra due elaborazioni
+diff_file = "score_diff.json"
+
+# Differenze mostrate a video
+DEFAULT_TOP = 20
+
+
+# Funzione per leggere da un file di risultati solo i campi necessari al
+# confronto. Il dataset viene letto un elemento alla volta, quindi il codice
+# sorgente non resta mai in memoria. Le classi con lo stesso nome e percorso
+# (dataset senza percorso) si distinguono con un contatore di occorrenze.
+def iter_scores(path):
+    occurrences = {}
+    for result in iter_dataset(path):
+        name = result.get("name", "Unknown")
+        file_path = result.get("path")
+        occurrence = occurrences.get((name, file_path), 0)
+        occurrences[(name, file_path)] = occurrence + 1
+        yield (name, file_path, occurrence), (result["category"], result["score"], bool(result["is_pfv"]))
+
+
+def _entry(key, **fields):
+    name, file_path, _occurrence = key
+    entry = {"name": name}
+    if file_path is not None:
+        entry["path"] = file_path
+    entry.update(fields)
+    return entry
+
+
+# Funzione per confrontare due elaborazioni con un hash join: la vecchia
+# viene indicizzata per (nome, percorso), la nuova scorre in streaming e
+# consuma l'indice. Quello che resta nell'indice sono le classi rimosse.
+# Le classi modificate sono ordinate dalla regressione più grande
+# (aumento di punteggio) al miglioramento più grande.
+def diff_scores(old_path, new_path):
+    old_scores = dict(iter_scores(old_path))
+    changed, added = [], []
+    unchanged = 0
+    for key, (category, score, pfv_flag) in iter_scores(new_path):
+        previous = old_scores.pop(key, None)
+        if previous is None:
+            added.append(_entry(key, category=category, score=score, is_pfv=pfv_flag))
+            continue
+        old_category, old_score, old_pfv = previous
+        if (old_category, old_score, old_pfv) == (category, score, pfv_flag):
+            unchanged += 1
+            continue
+        entry = _entry(key, old_score=old_score, score=score, delta=score - old_score, is_pfv=pfv_flag)
+        if old_category != category:
+            entry["old_category"] = old_category
+            entry["category"] = category
+        if pfv_flag and not old_pfv:
+            entry["new_pfv"] = True
+        changed.append(entry)
+
+    removed = [
+        _entry(key, category=category, score=score, is_pfv=pfv_flag)
+        for key, (category, score, pfv_flag) in old_scores.items()
+    ]
+    changed.sort(key=lambda entry: (-entry["delta"], entry["name"]))
+    added.sort(key=lambda entry: (-entry["score"], entry["name"]))
+    removed.sort(key=lambda entry: (-entry["score"], entry["name"]))
+    return {
+        "summary": {
+            "unchanged": unchanged,
+            "changed": len(changed),
+            "regressions": sum(1 for entry in changed if entry["delta"] > 0),
+            "improvements": sum(1 for entry in changed if entry["delta"] < 0),
+            "category_changes": sum(1 for entry in changed if "old_category" in entry),
+            "new_pfv": sum(1 for entry in changed if entry.get("new_pfv"))
+                       + sum(1 for entry in added if entry["is_pfv"]),
+            "added": len(added),
+            "removed": len(removed),
+        },
+        "changed": changed,
+        "added": added,
+        "removed": removed,
+    }
+
+
+def _print_report(report, top):
+    summary = report["summary"]
+    print(
+        f"Classi modificate: {summary['changed']} (peggiorate: {summary['regressions']}, "
+        f"migliorate: {summary['improvements']}, cambi di categoria: {summary['category_changes']}), "
+        f"aggiunte: {summary['added']}, rimosse: {summary['removed']}, nuove PFV: {summary['new_pfv']}"
+    )
+    for entry in report["changed"][:top]:
+        if entry["delta"] <= 0:
+            break
+        notes = []
+        if "old_category" in entry:
+            notes.append(f"{entry['old_category']} -> {entry['category']}")
+        if entry.get("new_pfv"):
+            notes.append("nuova PFV")
+        suffix = f" ({', '.join(notes)})" if notes else ""
+        print(f"  +{entry['delta']:<4} {entry['name']}: {entry['old_score']} -> {entry['score']}{suffix}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Confronta i punteggi di due elaborazioni di score_calculator")
+    parser.add_argument("old", help="Risultati di riferimento (array JSON o JSONL)")
+    parser.add_argument("new", help="Risultati da confrontare (array JSON o JSONL)")
+    parser.add_argument("--output", default=diff_file, help=f"Report JSON delle differenze (default: {diff_file})")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Regressioni mostrate a video")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Termina con codice 1 se ci sono classi peggiorate o nuove PFV")
+    args = parser.parse_args()
+
+    report = diff_scores(args.old, args.new)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+    _print_report(report, args.top)
+    print(f"Report salvato in: {args.output}")
+
+    summary = report["summary"]
+    if args.fail_on_regression and (summary["regressions"] or summary["new_pfv"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import json
+
+from class_scanner import iter_dataset
+from method_complexity import HotspotRanking
+from scores_db import git_revision
+
+# Storico in sola aggiunta degli aggregati di ogni elaborazione (opzionale, --history di score_calculator)
+history_file = "score_history.jsonl"
+
+# Classi peggiori salvate per ogni elaborazione
+TOP_OFFENDERS = 10
+
+
+# Storico delle elaborazioni: un file JSONL in sola aggiunta, una riga
+# compatta per elaborazione con data, commit, istogramma, percentuale di
+# PFV per categoria e classi peggiori. Aggiungere una riga costa O(1)
+# qualunque sia la lunghezza dello storico. Gli aggregati vengono presi
+# dal riepilogo (ScoreSummary) della stessa elaborazione.
+class ScoreHistory:
+    def __init__(self, summary, path=history_file, top=TOP_OFFENDERS):
+        self.summary = summary
+        self.path = path
+        self.offenders = HotspotRanking(top)
+
+    def add(self, result):
+        entry = {"name": result["name"], "category": result["category"], "score": result["score"]}
+        if "path" in result:
+            entry["path"] = result["path"]
+        self.offenders.add(result["score"], entry)
+
+    def record(self):
+        summary = self.summary.summary()
+        return {
+            "date": summary["generated_at"],
+            "git_sha": git_revision(),
+            "classes": summary["classes"],
+            "pfv": summary["pfv"],
+            "histogram": summary["histogram"],
+            "pfv_rate": {
+                category: round(counts["pfv"] / counts["total"], 4)
+                for category, counts in summary["categories"].items()
+            },
+            "categories": summary["categories"],
+            "top_offenders": self.offenders.top(),
+        }
+
+    def close(self):
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(self.record(), ensure_ascii=False, separators=(",", ":")))
+            file.write("\n")
+        print(f"Elaborazione aggiunta allo storico: {self.path}")
+
+
+# Funzione per leggere lo storico, dalla prima all'ultima elaborazione
+def load_history(path=history_file):
+    return list(iter_dataset(path))
@@ -0,0 +1,73 @@
+import json
+from collections import Counter
+from datetime import datetime, timezone
+
+# Riepilogo per i grafici: conteggi, istogramma e PFV per categoria
+summary_file = "score_summary.json"
+
+# Numero di intervalli dell'istogramma dei punteggi
+HISTOGRAM_BINS = 10
+
+
+# Funzione per calcolare un istogramma a intervalli uguali tra il punteggio
+# minimo e il massimo (stessa suddivisione di numpy.histogram e plt.hist:
+# l'ultimo intervallo include il massimo) partendo dai conteggi per punteggio
+def histogram(score_counts, bins=HISTOGRAM_BINS):
+    if not score_counts:
+        return {"edges": [], "counts": []}
+    low, high = float(min(score_counts)), float(max(score_counts))
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    edges = [low + width * index for index in range(bins)] + [high]
+    counts = [0] * bins
+    for score, count in score_counts.items():
+        counts[min(int((score - low) / width), bins - 1)] += count
+    return {"edges": edges, "counts": counts}
+
+
+# Riepilogo di un'elaborazione: pochi KB con tutto quello che serve ai
+# grafici di graph_score_calculator, così non occorre rileggere i risultati
+# completi. score_calculator lo scrive sempre, come uscita aggiuntiva.
+class ScoreSummary:
+    def __init__(self, path=summary_file, input_path=None, output_path=None):
+        self.path = path
+        self.input_path = input_path
+        self.output_path = output_path
+        self.score_counts = Counter()
+        self.totals = Counter()
+        self.pfv = Counter()
+
+    def add(self, result):
+        category = result["category"]
+        self.score_counts[result["score"]] += 1
+        self.totals[category] += 1
+        if result["is_pfv"]:
+            self.pfv[category] += 1
+
+    def summary(self):
+        classes = sum(self.totals.values())
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "input": self.input_path,
+            "output": self.output_path,
+            "classes": classes,
+            "pfv": sum(self.pfv.values()),
+            "score_counts": {str(score): count for score, count in sorted(self.score_counts.items())},
+            "histogram": histogram(self.score_counts),
+            "categories": {
+                category: {"total": total, "pfv": self.pfv[category]}
+                for category, total in sorted(self.totals.items())
+            },
+        }
+
+    def close(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=4)
+        print(f"Riepilogo salvato in: {self.path}")
+
+
+# Funzione per leggere il riepilogo scritto da ScoreSummary
+def load_summary(path=summary_file):
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
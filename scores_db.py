@@ -0,0 +1,201 @@
+import argparse
+import sqlite3
+import subprocess
+import time
+from datetime import datetime, timezone
+
+# Storico interrogabile dei risultati di ogni elaborazione (opzionale, --db di score_calculator)
+database_file = "score_history.sqlite"
+
+# Righe inserite per ogni transazione
+INSERT_BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    git_sha TEXT,
+    classes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS class_scores (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    path TEXT,
+    category TEXT NOT NULL,
+    complexity INTEGER NOT NULL,
+    srp INTEGER NOT NULL,
+    ocp INTEGER NOT NULL,
+    isp INTEGER NOT NULL,
+    dip INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    is_pfv INTEGER NOT NULL,
+    max_method_complexity INTEGER,
+    fan_in INTEGER,
+    fan_out INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_class_scores_category ON class_scores (run_id, category, score);
+CREATE INDEX IF NOT EXISTS idx_class_scores_score ON class_scores (run_id, score);
+CREATE INDEX IF NOT EXISTS idx_class_scores_pfv ON class_scores (run_id, is_pfv, score);
+CREATE INDEX IF NOT EXISTS idx_class_scores_name ON class_scores (name, run_id);
+CREATE INDEX IF NOT EXISTS idx_history_category ON class_scores (category, score);
+CREATE INDEX IF NOT EXISTS idx_history_pfv ON class_scores (is_pfv, score);
+"""
+
+# Colonne interrogabili e ordinabili da riga di comando
+QUERY_COLUMNS = ("name", "path", "category", "complexity", "srp", "ocp", "isp", "dip", "score",
+                 "is_pfv", "max_method_complexity", "fan_in", "fan_out")
+
+
+# Funzione per leggere l'hash del commit corrente (None fuori da un repository git)
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def connect(path=database_file):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+# Salvataggio dei risultati di un'elaborazione come nuova "run" nel database.
+# Usato da score_calculator (--db) come uscita aggiuntiva.
+class ScoreDatabaseWriter:
+    def __init__(self, path=database_file):
+        self.path = path
+        self.connection = connect(path)
+        cursor = self.connection.execute(
+            "INSERT INTO runs (created_at, git_sha) VALUES (?, ?)",
+            (datetime.now(timezone.utc).isoformat(timespec="seconds"), git_revision()),
+        )
+        self.run_id = cursor.lastrowid
+        self.count = 0
+        self._rows = []
+
+    def add(self, result):
+        metrics = result["metrics"]
+        coupling = result.get("coupling", {})
+        self._rows.append((
+            self.run_id, result["name"], result.get("path"), result["category"],
+            metrics.get("complexity", 0), metrics.get("srp", 0), metrics.get("ocp", 0),
+            metrics.get("isp", 0), metrics.get("dip", 0), result["score"], int(result["is_pfv"]),
+            result.get("max_method_complexity"), coupling.get("fan_in"), coupling.get("fan_out"),
+        ))
+        if len(self._rows) >= INSERT_BATCH:
+            self._flush()
+
+    def _flush(self):
+        self.connection.executemany(
+            "INSERT INTO class_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._rows
+        )
+        self.count += len(self._rows)
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        self.connection.execute("UPDATE runs SET classes = ? WHERE id = ?", (self.count, self.run_id))
+        self.connection.commit()
+        self.connection.close()
+        print(f"Risultati salvati nel database {self.path} (run {self.run_id}, {self.count} classi)")
+
+
+# Funzione per trovare l'id della run richiesta ("latest" = la più recente,
+# "all" = tutto lo storico, restituito come None)
+def resolve_run(connection, run):
+    if run == "all":
+        return None
+    if run == "latest":
+        row = connection.execute("SELECT MAX(id) FROM runs").fetchone()
+        if row[0] is None:
+            raise SystemExit("Il database non contiene ancora nessuna run")
+        return row[0]
+    return int(run)
+
+
+# Funzione per interrogare i risultati di una run (o di tutte, run_id=None)
+# con filtri e ordinamento. Gli indici su (run_id, category/score/is_pfv)
+# coprono le ricerche su una run, quelli senza run_id lo storico completo.
+def query_scores(connection, run_id, category=None, pfv=None, min_score=None, min_complexity=None,
+                 name=None, order_by="score", limit=20):
+    if order_by not in QUERY_COLUMNS:
+        raise ValueError(f"Colonna di ordinamento non valida: {order_by}")
+    conditions, parameters = [], []
+    if run_id is not None:
+        conditions.append("run_id = ?")
+        parameters.append(run_id)
+    if category:
+        conditions.append("category = ?")
+        parameters.append(category)
+    if pfv is not None:
+        conditions.append("is_pfv = ?")
+        parameters.append(int(pfv))
+    if min_score is not None:
+        conditions.append("score >= ?")
+        parameters.append(min_score)
+    if min_complexity is not None:
+        conditions.append("complexity >= ?")
+        parameters.append(min_complexity)
+    if name:
+        conditions.append("name LIKE ?")
+        parameters.append(name)
+    columns = ("run_id",) + QUERY_COLUMNS
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    sql = f"SELECT {', '.join(columns)} FROM class_scores {where}ORDER BY {order_by} DESC, run_id DESC, name LIMIT ?"
+    parameters.append(limit)
+    cursor = connection.execute(sql, parameters)
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def _print_rows(rows, columns):
+    widths = {column: max([len(column)] + [len(str(row[column])) for row in rows]) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(widths[column]) for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interroga lo storico dei punteggi delle classi PHP")
+    parser.add_argument("--db", default=database_file, help=f"Database SQLite (default: {database_file})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("runs", help="Elenca le run salvate")
+
+    query = commands.add_parser("query", help="Cerca classi in una run")
+    query.add_argument("--run", default="latest", help="Id della run, 'latest' oppure 'all' per tutto lo storico")
+    query.add_argument("--category", help="simple_service, controller, interface_or_trait, domain_class")
+    query.add_argument("--pfv", dest="pfv", action="store_true", default=None, help="Solo le classi PFV")
+    query.add_argument("--no-pfv", dest="pfv", action="store_false", help="Solo le classi non PFV")
+    query.add_argument("--min-score", type=int)
+    query.add_argument("--min-complexity", type=int)
+    query.add_argument("--name", help="Filtro sul nome (sintassi LIKE, es. '%%Controller')")
+    query.add_argument("--order-by", default="score", choices=QUERY_COLUMNS)
+    query.add_argument("--top", type=int, default=20, help="Numero massimo di righe")
+    args = parser.parse_args()
+
+    connection = connect(args.db)
+    if args.command == "runs":
+        rows = [
+            dict(zip(("id", "created_at", "git_sha", "classes"), row))
+            for row in connection.execute("SELECT id, created_at, git_sha, classes FROM runs ORDER BY id")
+        ]
+        _print_rows(rows, ("id", "created_at", "git_sha", "classes"))
+        return
+
+    started = time.perf_counter()
+    run_id = resolve_run(connection, args.run)
+    rows = query_scores(
+        connection, run_id, category=args.category, pfv=args.pfv, min_score=args.min_score,
+        min_complexity=args.min_complexity, name=args.name, order_by=args.order_by, limit=args.top,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    _print_rows(rows, ("run_id", "name", "category", "score", "is_pfv", "complexity", "path"))
+    print(f"{len(rows)} classi (run {args.run if run_id is None else run_id}) in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
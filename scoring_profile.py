@@ -0,0 +1,141 @@
+import cProfile
+import json
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+
+# File di default del report di profilazione
+profile_file = "score_profile.json"
+
+# Fasi riportate nel report, nell'ordine della pipeline
+PROFILE_STAGES = ("load", "cache", "metrics", "categorize", "score", "dump")
+
+# Funzioni riportate nel riepilogo cProfile
+CPROFILE_TOP = 30
+
+
+# Raccoglie i tempi di ogni fase di un'elaborazione e, se richiesto, un
+# campione cProfile del ciclo di calcolo (un blocco ogni sample_every).
+# I tempi di metrics/categorize/score con più worker sono la somma dei tempi
+# misurati nei processi, quindi possono superare il tempo reale.
+class StageProfiler:
+    def __init__(self, sample_every=0):
+        self.seconds = {stage: 0.0 for stage in PROFILE_STAGES}
+        self.classes = 0
+        self.bytes = 0
+        self.sample_every = sample_every
+        self.sampled_chunks = 0
+        self._chunks = 0
+        self._cprofile = cProfile.Profile() if sample_every else None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def timed(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] += time.perf_counter() - started
+
+    # Misura il tempo speso a produrre gli elementi di un iteratore
+    def timed_iter(self, stage, iterable):
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.seconds[stage] += time.perf_counter() - started
+                return
+            self.seconds[stage] += time.perf_counter() - started
+            yield item
+
+    def add_timings(self, timings):
+        for stage, seconds in timings.items():
+            self.seconds[stage] += seconds
+
+    def count_chunk(self, chunk):
+        self.classes += len(chunk)
+        self.bytes += sum(len(class_data.get("code", "").encode("utf-8")) for class_data in chunk)
+
+    # Indica se il prossimo blocco va eseguito sotto cProfile
+    def should_sample(self):
+        if not self.sample_every:
+            return False
+        self._chunks += 1
+        return (self._chunks - 1) % self.sample_every == 0
+
+    def run_sampled(self, function, *args):
+        self.sampled_chunks += 1
+        return self._cprofile.runcall(function, *args)
+
+    def report(self, workers=1):
+        wall_seconds = time.perf_counter() - self._started
+        report = {
+            "classes": self.classes,
+            "bytes": self.bytes,
+            "workers": workers,
+            "wall_seconds": round(wall_seconds, 6),
+            "classes_per_sec": round(self.classes / wall_seconds, 2) if wall_seconds else None,
+            "bytes_per_sec": round(self.bytes / wall_seconds, 2) if wall_seconds else None,
+            "stages": {stage: round(seconds, 6) for stage, seconds in self.seconds.items()},
+        }
+        if self._cprofile is not None:
+            report["cprofile"] = {
+                "sample_every": self.sample_every,
+                "sampled_chunks": self.sampled_chunks,
+                "top": self._cprofile_top(),
+            }
+        return report
+
+    def _cprofile_top(self):
+        if not self.sampled_chunks:
+            return []
+        stats = pstats.Stats(self._cprofile)
+        rows = []
+        for (filename, line, function), (_calls, calls, tottime, cumtime, _callers) in stats.stats.items():
+            rows.append({
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            })
+        rows.sort(key=lambda row: row["tottime"], reverse=True)
+        return rows[:CPROFILE_TOP]
+
+    def write_report(self, path, workers=1):
+        report = self.report(workers)
+        with open(path, "w") as file:
+            json.dump(report, file, indent=4)
+        return report
+
+
+# Avanzamento a bassa frequenza: invece di una riga per classe stampa al
+# massimo una riga ogni `interval` secondi con il totale e la velocità.
+class ProgressReporter:
+    def __init__(self, interval=1.0, stream=None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.count = 0
+        self.pfv = 0
+        self._started = time.perf_counter()
+        self._next_report = self._started + interval
+
+    def update(self, result):
+        self.count += 1
+        if result.get("is_pfv"):
+            self.pfv += 1
+        now = time.perf_counter()
+        if now >= self._next_report:
+            self._next_report = now + self.interval
+            self._write(now, f"ultima: {result['name']}")
+
+    def finish(self):
+        self._write(time.perf_counter(), "completato")
+
+    def _write(self, now, suffix):
+        elapsed = now - self._started
+        rate = self.count / elapsed if elapsed else 0.0
+        self.stream.write(f"Classi elaborate: {self.count} (PFV: {self.pfv}, {rate:.0f}/s) - {suffix}\n")
+        self.stream.flush()
@@ -0,0 +1,10 @@
+from dependency_graph import extract_dependencies
+
+
+# Le classi anonime non entrano nel grafo: prima "new readonly class extends"
+# registrava una classe App\extends
+def test_anonymous_classes_are_not_graph_nodes():
+    assert extract_dependencies("<?php namespace App; return new class extends Migration { };") == {}
+    assert extract_dependencies("<?php namespace App; return new readonly class extends Migration { };") == {}
+    source = "<?php namespace App; class A extends B { function f() { return new class extends C {}; } }"
+    assert extract_dependencies(source) == {"App\\A": {"App\\B", "App\\C"}}
@@ -0,0 +1,15 @@
+from php_scanner import extract_class_spans
+
+
+# Le classi anonime fuori da ogni classe (es. le migrazioni di Laravel) non
+# sono dichiarazioni: prima venivano registrate con il nome "extends"
+def test_anonymous_classes_are_not_declarations():
+    migration = "<?php\n\nreturn new class extends Migration {\n    public function up() {}\n};\n"
+    assert extract_class_spans(migration) == []
+    assert extract_class_spans("<?php $x = new class implements Countable { };") == []
+    assert extract_class_spans("<?php $x = new readonly class(1) { };") == []
+
+
+def test_anonymous_classes_stay_inside_their_class():
+    source = "<?php final class A extends B { function f() { return new class extends C {}; } }"
+    assert extract_class_spans(source) == [("class", "A", 6, len(source))]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tabelle di traduzione dei traits, separate per sezione e precompilate per ogni lingua
+"""
+
+import argparse
+import json
+import re
+from types import MappingProxyType
+
+from translate_traits import LOCALES, SOURCE_LOCALE, lang_dir, locale_values, parse_trait_file, trait_path
+
+# File compatto con le tabelle di tutte le lingue
+lookup_file = "trait_lookup.json"
+LOOKUP_VERSION = 1
+
+# Commento che apre un gruppo della sezione 'values' (es. // Finish values)
+VALUE_GROUP = re.compile(r"^\s*// (.+) values\s*$")
+
+
+# Funzione per costruire il nome dell'ambito di una voce. I valori sono
+# separati per gruppo ("values/Finish", "values/Hardware Finish"), perché lo
+# stesso termine italiano ha traduzioni diverse in gruppi diversi
+# (es. 'Lucido' -> 'Glossy' nelle finiture, 'Polished' nella ferramenta).
+def scope_name(section, group=None):
+    return f"{section}/{group}" if group else section
+
+
+# Funzione per estrarre dal modello italiano le coppie (ambito, termine
+# italiano, chiave, occorrenza) nell'ordine del file
+def template_terms(template):
+    group = None
+    for item in template:
+        if isinstance(item, str):
+            match = VALUE_GROUP.match(item)
+            if match:
+                group = match.group(1)
+            continue
+        _indent, section, key, occurrence, italian, _ending = item
+        yield scope_name(section, group if section == "values" else None), italian, key, occurrence
+
+
+# Tabelle di una lingua, in sola lettura:
+# - forward: (ambito, termine italiano) -> traduzioni, la prima è quella principale;
+# - reverse: (ambito, traduzione) -> termini italiani candidati.
+# Le tuple conservano l'ordine del file quando un termine ha più traduzioni
+# (es. 'Intarsio' -> 'Marquetry', 'Inlay') o una traduzione più termini
+# (es. 'Trapuntato' e 'Matelassé' -> 'Matelassé' in francese).
+class TraitLookup:
+    def __init__(self, locale, pairs):
+        self.locale = locale
+        self.pairs = tuple(pairs)
+        forward, reverse = {}, {}
+        for scope, term, translation in self.pairs:
+            if translation not in forward.get((scope, term), ()):
+                forward[(scope, term)] = forward.get((scope, term), ()) + (translation,)
+            if term not in reverse.get((scope, translation), ()):
+                reverse[(scope, translation)] = reverse.get((scope, translation), ()) + (term,)
+        self.forward = MappingProxyType(forward)
+        self.reverse = MappingProxyType(reverse)
+
+    def translate(self, scope, term, default=None):
+        translations = self.forward.get((scope, term))
+        return translations[0] if translations else default
+
+    def alternatives(self, scope, term):
+        return self.forward.get((scope, term), ())
+
+    def sources(self, scope, translation):
+        return self.reverse.get((scope, translation), ())
+
+    def scopes(self):
+        return sorted({scope for scope, _term, _translation in self.pairs})
+
+
+# Funzione per costruire le tabelle di tutte le lingue dai file
+# trait_elements.php, leggendo il modello italiano una sola volta
+def build_lookups(locales=LOCALES, directory=lang_dir):
+    terms = list(template_terms(parse_trait_file(trait_path(SOURCE_LOCALE, directory))))
+    lookups = {}
+    for locale in locales:
+        if locale == SOURCE_LOCALE:
+            continue
+        values = locale_values(trait_path(locale, directory))
+        pairs = [
+            (scope, italian, values[(scope.split("/")[0], key, occurrence)])
+            for scope, italian, key, occurrence in terms
+            if (scope.split("/")[0], key, occurrence) in values
+        ]
+        lookups[locale] = TraitLookup(locale, pairs)
+    return lookups
+
+
+# Funzioni per salvare e rileggere le tabelle in un JSON compatto:
+# per lingua e ambito, la lista delle coppie [termine, traduzione]
+def save_lookups(lookups, path=lookup_file):
+    data = {"version": LOOKUP_VERSION, "locales": {}}
+    for locale, lookup in lookups.items():
+        scopes = {}
+        for scope, term, translation in lookup.pairs:
+            scopes.setdefault(scope, []).append([term, translation])
+        data["locales"][locale] = scopes
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_lookups(path=lookup_file):
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    if data.get("version") != LOOKUP_VERSION:
+        raise ValueError(f"{path}: versione delle tabelle non supportata, rigenerarle con trait_lookup.py")
+    return {
+        locale: TraitLookup(locale, [
+            (scope, term, translation)
+            for scope, pairs in scopes.items()
+            for term, translation in pairs
+        ])
+        for locale, scopes in data["locales"].items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompila le tabelle di traduzione dei traits per sezione")
+    parser.add_argument("--lang-dir", default=lang_dir, help=f"Cartella delle lingue (default: {lang_dir})")
+    parser.add_argument("--output", default=lookup_file, help=f"File delle tabelle (default: {lookup_file})")
+    args = parser.parse_args()
+
+    lookups = build_lookups(directory=args.lang_dir)
+    save_lookups(lookups, args.output)
+    terms = sum(len(lookup.forward) for lookup in lookups.values())
+    print(f"Tabelle di {len(lookups)} lingue ({terms} termini) salvate in: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,583 +3,218 @@
 Script per creare i file di traduzione dei traits mantenendo la struttura esatta del file italiano
 """
 
-# Dizionari di traduzione per ogni lingua
-translations = {
-    'en': {
-        # Categories
-        'Materiali': 'Materials',
-        'Visuale': 'Visual', 
-        'Dimensioni': 'Dimensions',
-        'Speciale': 'Special',
-        'Sostenibilità': 'Sustainability',
-        'Culturale': 'Cultural',
-        'Accessori': 'Accessories',
-        'Categorie': 'Categories',
-        
-        # Trait Types
-        'Materiale Primario': 'Primary Material',
-        'Finitura': 'Finish',
-        'Tecnica': 'Technique',
-        'Colore Primario': 'Primary Color',
-        'Stile': 'Style',
-        'Atmosfera': 'Mood',
-        'Dimensione': 'Size',
-        'Peso': 'Weight',
-        'Altezza': 'Height',
-        'Larghezza': 'Width',
-        'Edizione': 'Edition',
-        'Firma': 'Signature',
-        'Condizione': 'Condition',
-        'Anno di Creazione': 'Year Created',
-        'Contenuto Riciclato': 'Recycled Content',
-        'Impronta Carbonica': 'Carbon Footprint',
-        'Certificazione Eco': 'Eco Certification',
-        'Punteggio Sostenibilità': 'Sustainability Score',
-        'Origine Culturale': 'Cultural Origin',
-        'Focus Tematico': 'Thematic Focus',
-        'Tecnica Artigianale': 'Artisan Technique',
-        'Tipo di Edizione': 'Edition Type',
-        
-        # Accessory Types
-        'Tipo di Accessorio': 'Accessory Type',
-        'Componente Accessorio': 'Accessory Component',
-        'Tipo di Chiusura': 'Closure Type',
-        'Finitura Hardware': 'Hardware Finish',
-        'Tipo di Cinghia': 'Strap Type',
-        'Layout Tasche': 'Pocket Layout',
-        'Categoria Dimensioni': 'Size Category',
-        'Texture': 'Texture',
-        'Fodera': 'Lining',
-        'Occasione': 'Occasion',
-        'Compatibilità': 'Compatibility',
-        'Protezione Acqua': 'Water Protection',
-        'Personalizzazione': 'Personalization',
-        'Struttura': 'Structure',
-        
-        # Values - Categories
-        'Giochi': 'Games',
-        'Business': 'Business',
-        'Arte': 'Art',
-        'Musica': 'Music',
-        'Sport': 'Sports',
-        'Educazione': 'Education',
-        'Scienza': 'Science',
-        'Tecnologia': 'Technology',
-        'Collezionabili': 'Collectibles',
-        'Fantasy': 'Fantasy',
-        'Storia': 'History',
-        'Natura': 'Nature',
-        'Moda': 'Fashion',
-        'Cibo': 'Food',
-        'Viaggi': 'Travel',
-        
-        # Materials
-        'Legno': 'Wood',
-        'Metallo': 'Metal',
-        'Tela': 'Canvas',
-        'Carta': 'Paper',
-        'Ceramica': 'Ceramic',
-        'Vetro': 'Glass',
-        'Pietra': 'Stone',
-        'Tessuto': 'Fabric',
-        'Plastica': 'Plastic',
-        'Tecnica Mista': 'Mixed Media',
-        'Pelle': 'Leather',
-        'Argilla': 'Clay',
-        'Marmo': 'Marble',
-        'Granito': 'Granite',
-        'Cemento': 'Concrete',
-        'Gesso': 'Plaster',
-        'Resina': 'Resin',
-        'Gomma': 'Rubber',
-        'Acrilico': 'Acrylic',
-        'Inchiostro': 'Ink',
-        'Pittura a Olio': 'Oil Paint',
-        'Acquerello': 'Watercolor',
-        'Carboncino': 'Charcoal',
-        'Pastello': 'Pastel',
-        'Digitale': 'Digital',
-        'Fotografico': 'Photographic',
-        'Organico': 'Organic',
-        'Riciclato': 'Recycled',
-        'Composito': 'Composite',
-        
-        # Finish
-        'Opaco': 'Matte',
-        'Lucido': 'Glossy',
-        'Satinato': 'Satin',
-        'Grezzo': 'Raw',
-        'Lucidato': 'Polished',
-        'Spazzolato': 'Brushed',
-        'Patina': 'Patina',
-        'Texturizzato': 'Textured',
-        
-        # Primary Colors
-        'Rosso': 'Red',
-        'Blu': 'Blue',
-        'Verde': 'Green',
-        'Giallo': 'Yellow',
-        'Arancione': 'Orange',
-        'Viola': 'Purple',
-        'Nero': 'Black',
-        'Bianco': 'White',
-        'Grigio': 'Gray',
-        'Marrone': 'Brown',
-        'Oro': 'Gold',
-        'Argento': 'Silver',
-        
-        # Style
-        'Moderno': 'Modern',
-        'Classico': 'Classic',
-        'Minimalista': 'Minimalist',
-        'Astratto': 'Abstract',
-        'Realistico': 'Realistic',
-        'Surreale': 'Surreal',
-        'Pop Art': 'Pop Art',
-        'Rinascimentale': 'Renaissance',
-        'Contemporaneo': 'Contemporary',
-        
-        # Mood
-        'Sereno': 'Serene',
-        'Energico': 'Energetic',
-        'Misterioso': 'Mysterious',
-        'Gioioso': 'Joyful',
-        'Melanconico': 'Melancholic',
-        'Drammatico': 'Dramatic',
-        'Pacifico': 'Peaceful',
-        'Intenso': 'Intense',
-        
-        # Size
-        'Extra Piccolo': 'Extra Small',
-        'Piccolo': 'Small',
-        'Medio': 'Medium',
-        'Grande': 'Large',
-        'Extra Grande': 'Extra Large',
-        
-        # Edition
-        '1/1': '1/1',
-        'Edizione Limitata': 'Limited Edition',
-        'Edizione Aperta': 'Open Edition',
-        'Prova d\'Artista': 'Artist Proof',
-        'Prima Edizione': 'First Edition',
-        
-        # Signature
-        'Firmato': 'Signed',
-        'Non Firmato': 'Unsigned',
-        'Firmato e Numerato': 'Signed & Numbered',
-        'Certificato di Autenticità': 'Certificate of Authenticity',
-        
-        # Condition
-        'Perfetto': 'Mint',
-        'Eccellente': 'Excellent',
-        'Buono': 'Good',
-        'Discreto': 'Fair',
-        'Restaurato': 'Restored',
-        'Vintage': 'Vintage',
-        'Nuovo': 'New',
-        
-        # Carbon Footprint
-        'Neutro in Carbonio': 'Carbon Neutral',
-        'Basso Impatto': 'Low Impact',
-        'Medio Impatto': 'Medium Impact',
-        'Compensato': 'Offset Compensated',
-        
-        # Eco Certification
-        'Certificato FSC': 'FSC Certified',
-        'Biologico': 'Organic',
-        'Commercio Equo': 'Fair Trade',
-        'Biodegradabile': 'Biodegradable',
-        'Nessuna': 'None',
-        
-        # Accessory Type
-        'Borsa': 'Bag',
-        'Zaino': 'Backpack',
-        'Borsa Tote': 'Tote',
-        'Tracolla': 'Crossbody',
-        'Borsa a Spalla': 'Shoulder Bag',
-        'Pochette': 'Clutch',
-        'Portafoglio': 'Wallet',
-        'Porta Carte': 'Card Holder',
-        'Portamonete': 'Coin Purse',
-        'Cintura': 'Belt',
-        'Portachiavi': 'Keychain',
-        'Custodia Telefono': 'Phone Case',
-        'Custodia Laptop': 'Laptop Sleeve',
-        'Cinturino Orologio': 'Watch Strap',
-        'Occhiali da Sole': 'Sunglasses',
-        'Montatura Occhiali': 'Glasses Frame',
-        'Cappello': 'Hat',
-        'Sciarpa': 'Scarf',
-        'Guanti': 'Gloves',
-        'Ombrello': 'Umbrella',
-        
-        # Hardware
-        'Fibbia': 'Buckle',
-        'Cerniera': 'Zipper',
-        'Chiusura Magnetica': 'Magnetic Snap',
-        'Fermaglio': 'Clasp',
-        'Chiusura a Torsione': 'Twist Lock',
-        'Lucchetto': 'Padlock',
-        'Gancio': 'Hook',
-        'Laccio': 'Tie',
-        'Velcro': 'Velcro',
-        'Bottone': 'Button',
-        'Borchia': 'Stud',
-        'Rivetto': 'Rivet',
-        'Catena': 'Chain',
-        
-        # Structure and other
-        'Morbido': 'Soft',
-        'Semi-Strutturato': 'Semi-Structured',
-        'Strutturato': 'Structured',
-        'Imbottito': 'Padded',
-        'Liscio': 'Smooth',
-        'Goffrato': 'Pebbled',
-        'Saffiano': 'Saffiano',
-        'Trapuntato': 'Quilted',
-        'Intrecciato': 'Woven',
-        'Impresso': 'Embossed',
-        'Effetto Coccodrillo': 'Croc-Embossed',
-        'Finitura Scamosciata': 'Suede Finish',
-        'Matelassé': 'Matelassé',
-        'Senza Fodera': 'Unlined',
-        'Fodera in Cotone': 'Cotton Lining',
-        'Fodera in Microfibra': 'Microfiber Lining',
-        'Fodera Scamosciata': 'Suede Lining',
-        'Fodera in Raso': 'Satin Lining',
-        'Quotidiano': 'Everyday',
-        'Viaggio': 'Travel',
-        'Sera': 'Evening',
-        'Formale': 'Formal',
-        'Outdoor': 'Outdoor',
-        'Telefono': 'Phone',
-        'Tablet': 'Tablet',
-        'Laptop 13"': 'Laptop 13"',
-        'Laptop 14"': 'Laptop 14"',
-        'Laptop 15"': 'Laptop 15"',
-        'Laptop 16"': 'Laptop 16"',
-        'Passaporto': 'Passport',
-        'Resistente agli Schizzi': 'Splash Resistant',
-        'Resistente all\'Acqua': 'Water Resistant',
-        'Impermeabile': 'Waterproof',
-        'Monogramma': 'Monogram',
-        'Incisione': 'Engraving',
-        'Patch Personalizzata': 'Custom Patch',
-        'Colore Personalizzato': 'Custom Color',
-        
-        # Additional
-        'Regolabile': 'Adjustable',
-        'Rimovibile': 'Detachable',
-        'Manico Superiore': 'Top Handle',
-        'Spallacci Zaino': 'Backpack Straps',
-        'Cinturino da Polso': 'Wristlet',
-        'Mini': 'Mini',
-        'Oversize': 'Oversized',
-        'Coulisse': 'Drawstring',
-        'Gancio e Occhiello': 'Hook-and-Loop',
-        'Tasto a Leva': 'Toggle',
-        'Clip': 'Clip',
-        'Aperto in Alto': 'Open Top',
-        'Oro Rosa': 'Rose Gold',
-        'Nichel': 'Nickel',
-        'Gunmetal': 'Gunmetal',
-        'Ottone': 'Brass',
-        'Antico': 'Antique',
-        'Slot per Carte': 'Card Slots',
-        'Tasca Interna con Cerniera': 'Internal Zipper Pocket',
-        'Tasca Esterna': 'External Pocket',
-        'Tasca Aperta': 'Slip Pocket',
-        'Anello Penna': 'Pen Loop',
-        'Multi-Scomparto': 'Multi-Compartment',
-    },
-    
-    'fr': {
-        # Categories
-        'Materiali': 'Matériaux',
-        'Visuale': 'Visuel',
-        'Dimensioni': 'Dimensions',
-        'Speciale': 'Spécial',
-        'Sostenibilità': 'Durabilité',
-        'Culturale': 'Culturel',
-        'Accessori': 'Accessoires',
-        'Categorie': 'Catégories',
-        
-        # Trait Types
-        'Materiale Primario': 'Matériau Principal',
-        'Finitura': 'Finition',
-        'Tecnica': 'Technique',
-        'Colore Primario': 'Couleur Principale',
-        'Stile': 'Style',
-        'Atmosfera': 'Ambiance',
-        'Dimensione': 'Taille',
-        'Peso': 'Poids',
-        'Altezza': 'Hauteur',
-        'Larghezza': 'Largeur',
-        'Edizione': 'Édition',
-        'Firma': 'Signature',
-        'Condizione': 'Condition',
-        'Anno di Creazione': 'Année de Création',
-        'Contenuto Riciclato': 'Contenu Recyclé',
-        'Impronta Carbonica': 'Empreinte Carbone',
-        'Certificazione Eco': 'Certification Écologique',
-        'Punteggio Sostenibilità': 'Score de Durabilité',
-        'Origine Culturale': 'Origine Culturelle',
-        'Focus Tematico': 'Focus Thématique',
-        'Tecnica Artigianale': 'Technique Artisanale',
-        'Tipo di Edizione': 'Type d\'Édition',
-        
-        # Accessory Types  
-        'Tipo di Accessorio': 'Type d\'Accessoire',
-        'Componente Accessorio': 'Composant d\'Accessoire',
-        'Tipo di Chiusura': 'Type de Fermeture',
-        'Finitura Hardware': 'Finition de Quincaillerie',
-        'Tipo di Cinghia': 'Type de Sangle',
-        'Layout Tasche': 'Disposition des Poches',
-        'Categoria Dimensioni': 'Catégorie de Taille',
-        'Texture': 'Texture',
-        'Fodera': 'Doublure',
-        'Occasione': 'Occasion',
-        'Compatibilità': 'Compatibilité',
-        'Protezione Acqua': 'Protection Contre l\'Eau',
-        'Personalizzazione': 'Personnalisation',
-        'Struttura': 'Structure',
-        
-        # Values - Categories
-        'Giochi': 'Jeux',
-        'Business': 'Affaires',
-        'Arte': 'Art',
-        'Musica': 'Musique',
-        'Sport': 'Sports',
-        'Educazione': 'Éducation',
-        'Scienza': 'Science',
-        'Tecnologia': 'Technologie',
-        'Collezionabili': 'Objets de Collection',
-        'Fantasy': 'Fantaisie',
-        'Storia': 'Histoire',
-        'Natura': 'Nature',
-        'Moda': 'Mode',
-        'Cibo': 'Nourriture',
-        'Viaggi': 'Voyage',
-        
-        # Materials
-        'Legno': 'Bois',
-        'Metallo': 'Métal',
-        'Tela': 'Toile',
-        'Carta': 'Papier',
-        'Ceramica': 'Céramique',
-        'Vetro': 'Verre',
-        'Pietra': 'Pierre',
-        'Tessuto': 'Tissu',
-        'Plastica': 'Plastique',
-        'Tecnica Mista': 'Médias Mixtes',
-        'Pelle': 'Cuir',
-        'Argilla': 'Argile',
-        'Marmo': 'Marbre',
-        'Granito': 'Granit',
-        'Cemento': 'Béton',
-        'Gesso': 'Plâtre',
-        'Resina': 'Résine',
-        'Gomma': 'Caoutchouc',
-        'Acrilico': 'Acrylique',
-        'Inchiostro': 'Encre',
-        'Pittura a Olio': 'Peinture à l\'Huile',
-        'Acquerello': 'Aquarelle',
-        'Carboncino': 'Fusain',
-        'Pastello': 'Pastel',
-        'Digitale': 'Numérique',
-        'Fotografico': 'Photographique',
-        'Organico': 'Organique',
-        'Riciclato': 'Recyclé',
-        'Composito': 'Composite',
-        
-        # Finish
-        'Opaco': 'Mat',
-        'Lucido': 'Brillant',
-        'Satinato': 'Satiné',
-        'Grezzo': 'Brut',
-        'Lucidato': 'Poli',
-        'Spazzolato': 'Brossé',
-        'Patina': 'Patine',
-        'Texturizzato': 'Texturé',
-        
-        # Primary Colors
-        'Rosso': 'Rouge',
-        'Blu': 'Bleu',
-        'Verde': 'Vert',
-        'Giallo': 'Jaune',
-        'Arancione': 'Orange',
-        'Viola': 'Violet',
-        'Nero': 'Noir',
-        'Bianco': 'Blanc',
-        'Grigio': 'Gris',
-        'Marrone': 'Marron',
-        'Oro': 'Or',
-        'Argento': 'Argent',
-        
-        # Style
-        'Moderno': 'Moderne',
-        'Classico': 'Classique',
-        'Minimalista': 'Minimaliste',
-        'Astratto': 'Abstrait',
-        'Realistico': 'Réaliste',
-        'Surreale': 'Surréel',
-        'Pop Art': 'Pop Art',
-        'Rinascimentale': 'Renaissance',
-        'Contemporaneo': 'Contemporain',
-        
-        # Mood
-        'Sereno': 'Serein',
-        'Energico': 'Énergique',
-        'Misterioso': 'Mystérieux',
-        'Gioioso': 'Joyeux',
-        'Melanconico': 'Mélancolique',
-        'Drammatico': 'Dramatique',
-        'Pacifico': 'Paisible',
-        'Intenso': 'Intense',
-        
-        # Size
-        'Extra Piccolo': 'Très Petit',
-        'Piccolo': 'Petit',
-        'Medio': 'Moyen',
-        'Grande': 'Grand',
-        'Extra Grande': 'Très Grand',
-        
-        # Edition
-        '1/1': '1/1',
-        'Edizione Limitata': 'Édition Limitée',
-        'Edizione Aperta': 'Édition Ouverte',
-        'Prova d\'Artista': 'Épreuve d\'Artiste',
-        'Prima Edizione': 'Première Édition',
-        
-        # Signature
-        'Firmato': 'Signé',
-        'Non Firmato': 'Non Signé',
-        'Firmato e Numerato': 'Signé et Numéroté',
-        'Certificato di Autenticità': 'Certificat d\'Authenticité',
-        
-        # Condition
-        'Perfetto': 'Parfait',
-        'Eccellente': 'Excellent',
-        'Buono': 'Bon',
-        'Discreto': 'Correct',
-        'Restaurato': 'Restauré',
-        'Vintage': 'Vintage',
-        'Nuovo': 'Neuf',
-        
-        # Carbon Footprint
-        'Neutro in Carbonio': 'Neutre en Carbone',
-        'Basso Impatto': 'Faible Impact',
-        'Medio Impatto': 'Impact Moyen',
-        'Compensato': 'Compensé',
-        
-        # Eco Certification
-        'Certificato FSC': 'Certifié FSC',
-        'Biologico': 'Biologique',
-        'Commercio Equo': 'Commerce Équitable',
-        'Biodegradabile': 'Biodégradable',
-        'Nessuna': 'Aucune',
-        
-        # Accessory Type
-        'Borsa': 'Sac',
-        'Zaino': 'Sac à Dos',
-        'Borsa Tote': 'Cabas',
-        'Tracolla': 'Bandoulière',
-        'Borsa a Spalla': 'Sac à Épaule',
-        'Pochette': 'Pochette',
-        'Portafoglio': 'Portefeuille',
-        'Porta Carte': 'Porte-Cartes',
-        'Portamonete': 'Porte-Monnaie',
-        'Cintura': 'Ceinture',
-        'Portachiavi': 'Porte-Clés',
-        'Custodia Telefono': 'Étui Téléphone',
-        'Custodia Laptop': 'Housse Ordinateur',
-        'Cinturino Orologio': 'Bracelet de Montre',
-        'Occhiali da Sole': 'Lunettes de Soleil',
-        'Montatura Occhiali': 'Monture de Lunettes',
-        'Cappello': 'Chapeau',
-        'Sciarpa': 'Écharpe',
-        'Guanti': 'Gants',
-        'Ombrello': 'Parapluie',
-        
-        # Hardware
-        'Fibbia': 'Boucle',
-        'Cerniera': 'Fermeture Éclair',
-        'Chiusura Magnetica': 'Fermoir Magnétique',
-        'Fermaglio': 'Fermoir',
-        'Chiusura a Torsione': 'Verrou à Torsion',
-        'Lucchetto': 'Cadenas',
-        'Gancio': 'Crochet',
-        'Laccio': 'Lien',
-        'Velcro': 'Velcro',
-        'Bottone': 'Bouton',
-        'Borchia': 'Clou',
-        'Rivetto': 'Rivet',
-        'Catena': 'Chaîne',
-        
-        # Structure and other
-        'Morbido': 'Souple',
-        'Semi-Strutturato': 'Semi-Structuré',
-        'Strutturato': 'Structuré',
-        'Imbottito': 'Rembourré',
-        'Liscio': 'Lisse',
-        'Goffrato': 'Grainé',
-        'Saffiano': 'Saffiano',
-        'Trapuntato': 'Matelassé',
-        'Intrecciato': 'Tissé',
-        'Impresso': 'Gaufré',
-        'Effetto Coccodrillo': 'Embossé Croco',
-        'Finitura Scamosciata': 'Finition Daim',
-        'Matelassé': 'Matelassé',
-        'Senza Fodera': 'Non Doublé',
-        'Fodera in Cotone': 'Doublure Coton',
-        'Fodera in Microfibra': 'Doublure Microfibre',
-        'Fodera Scamosciata': 'Doublure Daim',
-        'Fodera in Raso': 'Doublure Satin',
-        'Quotidiano': 'Quotidien',
-        'Viaggio': 'Voyage',
-        'Sera': 'Soirée',
-        'Formale': 'Formel',
-        'Outdoor': 'Extérieur',
-        'Telefono': 'Téléphone',
-        'Tablet': 'Tablette',
-        'Laptop 13"': 'Ordinateur 13"',
-        'Laptop 14"': 'Ordinateur 14"',
-        'Laptop 15"': 'Ordinateur 15"',
-        'Laptop 16"': 'Ordinateur 16"',
-        'Passaporto': 'Passeport',
-        'Resistente agli Schizzi': 'Résistant aux Éclaboussures',
-        'Resistente all\'Acqua': 'Résistant à l\'Eau',
-        'Impermeabile': 'Étanche',
-        'Monogramma': 'Monogramme',
-        'Incisione': 'Gravure',
-        'Patch Personalizzata': 'Patch Personnalisé',
-        'Colore Personalizzato': 'Couleur Personnalisée',
-        
-        # Additional
-        'Regolabile': 'Ajustable',
-        'Rimovibile': 'Détachable',
-        'Manico Superiore': 'Poignée Supérieure',
-        'Spallacci Zaino': 'Sangles de Sac à Dos',
-        'Cinturino da Polso': 'Bracelet',
-        'Mini': 'Mini',
-        'Oversize': 'Surdimensionné',
-        'Coulisse': 'Cordon de Serrage',
-        'Gancio e Occhiello': 'Crochet et Boucle',
-        'Tasto a Leva': 'Bouton-Bascule',
-        'Clip': 'Pince',
-        'Aperto in Alto': 'Ouverture Libre',
-        'Oro Rosa': 'Or Rose',
-        'Nichel': 'Nickel',
-        'Gunmetal': 'Métal Pistolet',
-        'Ottone': 'Laiton',
-        'Antico': 'Antique',
-        'Slot per Carte': 'Fentes pour Cartes',
-        'Tasca Interna con Cerniera': 'Poche Intérieure à Fermeture',
-        'Tasca Esterna': 'Poche Extérieure',
-        'Tasca Aperta': 'Poche Glissière',
-        'Anello Penna': 'Boucle Stylo',
-        'Multi-Scomparto': 'Multi-Compartiments',
+import argparse
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+# Dizionari di traduzione (italiano -> lingua), uno per file JSON, accanto
+# a questo script qualunque sia la cartella corrente
+translations_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "trait_translations")
+
+# Lingue tenute in memoria contemporaneamente
+MAX_LOADED_LOCALES = 4
+
+
+# Catalogo delle traduzioni: ogni lingua viene letta dal proprio file JSON
+# solo al primo accesso e poi tenuta in memoria. Oltre MAX_LOADED_LOCALES
+# lingue si scarica quella usata meno di recente; evict_idle() scarica
+# quelle non usate da un certo tempo. Si comporta come un dizionario
+# lingua -> dizionario, così translations['en'] continua a funzionare.
+class TranslationCatalog(Mapping):
+    def __init__(self, directory=translations_dir, max_loaded=MAX_LOADED_LOCALES):
+        self.directory = directory
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()
+        self._last_used = {}
+
+    def _path(self, locale):
+        return os.path.join(self.directory, f"{locale}.json")
+
+    # Una cartella mancante è un errore di installazione, non un catalogo vuoto
+    def _check_directory(self):
+        if not os.path.isdir(self.directory):
+            raise FileNotFoundError(f"Cartella delle traduzioni non trovata: {self.directory}")
+
+    def __getitem__(self, locale):
+        if locale in self._loaded:
+            self._loaded.move_to_end(locale)
+        else:
+            self._check_directory()
+            try:
+                with open(self._path(locale), "r", encoding="utf-8") as file:
+                    self._loaded[locale] = json.load(file)
+            except FileNotFoundError:
+                raise KeyError(locale) from None
+            while len(self._loaded) > self.max_loaded:
+                oldest, _dictionary = self._loaded.popitem(last=False)
+                del self._last_used[oldest]
+        self._last_used[locale] = time.monotonic()
+        return self._loaded[locale]
+
+    def __contains__(self, locale):
+        if locale in self._loaded:
+            return True
+        self._check_directory()
+        return os.path.exists(self._path(locale))
+
+    def __iter__(self):
+        self._check_directory()
+        return iter(sorted(name[:-len(".json")] for name in os.listdir(self.directory) if name.endswith(".json")))
+
+    def __len__(self):
+        return sum(1 for _locale in self)
+
+    def loaded(self):
+        return list(self._loaded)
+
+    def evict(self, locale=None):
+        if locale is None:
+            self._loaded.clear()
+            self._last_used.clear()
+        elif locale in self._loaded:
+            del self._loaded[locale]
+            del self._last_used[locale]
+
+    def evict_idle(self, seconds):
+        limit = time.monotonic() - seconds
+        for locale in [locale for locale, used in self._last_used.items() if used < limit]:
+            self.evict(locale)
+
+
+translations = TranslationCatalog()
+
+# Cartella dei file di lingua di Laravel e file dei traits
+lang_dir = "resources/lang"
+trait_file = "trait_elements.php"
+
+# Lingua di riferimento e lingue generate
+SOURCE_LOCALE = "it"
+LOCALES = ("de", "en", "es", "fr", "it", "pt")
+
+# Riga di una sezione ('values' => [) e riga di una voce ('Chiave' => 'Valore',)
+SECTION_LINE = re.compile(r"^\s*'(\w+)' => \[\s*$")
+ENTRY_LINE = re.compile(r"^(\s*)'((?:[^'\\]|\\.)*)' => '((?:[^'\\]|\\.)*)',\s*$")
+
+
+# Funzioni per leggere e scrivere le stringhe PHP tra apici singoli
+def php_unescape(text):
+    return re.sub(r"\\([\\'])", r"\1", text)
+
+
+def php_escape(text):
+    return text.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def trait_path(locale, directory=lang_dir):
+    return os.path.join(directory, locale, trait_file)
+
+
+# Funzione per trasformare un file trait_elements.php in un modello: una
+# lista di righe, ognuna testo fisso (str) oppure voce
+# (rientro, sezione, chiave, occorrenza, valore, fine riga). L'occorrenza
+# distingue le chiavi ripetute nella stessa sezione (es. 'Artist Proof').
+def parse_trait_file(path):
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        lines = file.read().splitlines(keepends=True)
+    template = []
+    section = None
+    occurrences = {}
+    for line in lines:
+        content = line.rstrip("\r\n")
+        ending = line[len(content):]
+        match = ENTRY_LINE.match(content)
+        if match and section is not None:
+            indent, key, value = match.groups()
+            key = php_unescape(key)
+            occurrence = occurrences.get((section, key), 0)
+            occurrences[(section, key)] = occurrence + 1
+            template.append((indent, section, key, occurrence, php_unescape(value), ending))
+            continue
+        match = SECTION_LINE.match(content)
+        if match:
+            section = match.group(1)
+        template.append(line)
+    return template
+
+
+# Funzione per leggere i valori di una lingua, indicizzati per
+# (sezione, chiave, occorrenza). Un file mancante non ha valori.
+def locale_values(path):
+    if not os.path.exists(path):
+        return {}
+    return {
+        (section, key, occurrence): value
+        for section, key, occurrence, value in (
+            item[1:5] for item in parse_trait_file(path) if not isinstance(item, str)
+        )
     }
-}
 
-# Continuerò con le altre lingue nel prossimo file...
+
+# Funzione per produrre il file di una lingua dal modello italiano. Per ogni
+# voce si usa, nell'ordine: il valore già presente nel file della lingua,
+# la traduzione del dizionario, il testo italiano. Restituisce il contenuto
+# e il numero di voci rimaste in italiano.
+def render_locale(template, locale, existing, dictionary):
+    parts = []
+    untranslated = 0
+    for item in template:
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        indent, section, key, occurrence, italian, ending = item
+        value = existing.get((section, key, occurrence))
+        if value is None:
+            value = italian if locale == SOURCE_LOCALE else dictionary.get(italian)
+        if value is None:
+            value = italian
+            untranslated += 1
+        parts.append(f"{indent}'{php_escape(key)}' => '{php_escape(value)}',{ending}")
+    return "".join(parts).encode("utf-8"), untranslated
+
+
+# Funzione eseguita nei processi worker: genera il file di una lingua e lo
+# riscrive solo se il contenuto è cambiato, così i file invariati non
+# invalidano l'opcache al deploy
+def write_locale(template, locale, directory=lang_dir):
+    path = trait_path(locale, directory)
+    content, untranslated = render_locale(template, locale, locale_values(path), translations.get(locale, {}))
+    if os.path.exists(path):
+        with open(path, "rb") as file:
+            if file.read() == content:
+                return locale, False, untranslated
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+    return locale, True, untranslated
+
+
+# Funzione per generare tutte le lingue in parallelo dal file italiano,
+# letto una sola volta
+def generate_locales(locales=LOCALES, directory=lang_dir, workers=None):
+    template = parse_trait_file(trait_path(SOURCE_LOCALE, directory))
+    with ProcessPoolExecutor(max_workers=workers or len(locales)) as executor:
+        futures = [executor.submit(write_locale, template, locale, directory) for locale in locales]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera trait_elements.php per ogni lingua dal file italiano")
+    parser.add_argument("--lang-dir", default=lang_dir, help=f"Cartella delle lingue (default: {lang_dir})")
+    parser.add_argument("--locales", default=",".join(LOCALES), help="Lingue da generare, separate da virgola")
+    parser.add_argument("--workers", type=int, default=None, help="Processi (default: uno per lingua)")
+    args = parser.parse_args()
+
+    locales = tuple(locale.strip() for locale in args.locales.split(",") if locale.strip())
+    for locale, written, untranslated in generate_locales(locales, args.lang_dir, args.workers):
+        status = "aggiornato" if written else "invariato"
+        missing = f", {untranslated} voci senza traduzione (lasciate in italiano)" if untranslated else ""
+        print(f"{trait_path(locale, args.lang_dir)}: {status}{missing}")
+
+
+if __name__ == "__main__":
+    main()
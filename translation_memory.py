@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Memoria di traduzione dei traits: ricerca approssimata dei termini già tradotti e suggerimenti per i nuovi valori
+"""
+
+import argparse
+import json
+import re
+import time
+from collections import Counter, defaultdict
+
+from translate_traits import LOCALES, SOURCE_LOCALE, lang_dir, locale_values, parse_trait_file, trait_path, translations
+
+# Lunghezza degli n-grammi di caratteri dell'indice
+NGRAM_SIZE = 3
+
+# Somiglianza minima (coefficiente di Dice sugli n-grammi) di un termine simile
+MIN_SIMILARITY = 0.5
+
+# Termini simili considerati per ogni nuovo termine
+MAX_MATCHES = 5
+
+# Parole e numeri di un termine (es. 'Laptop 13"' -> 'Laptop', '13', '"')
+WORD = re.compile(r"\w+|[^\w\s]+")
+
+
+def normalize(term):
+    return " ".join(term.lower().split())
+
+
+# Funzione per calcolare gli n-grammi di un termine; gli spazi agli estremi
+# danno più peso all'inizio e alla fine delle parole
+def ngrams(term, size=NGRAM_SIZE):
+    padded = f" {normalize(term)} "
+    return {padded[index:index + size] for index in range(max(len(padded) - size + 1, 1))}
+
+
+# Memoria di traduzione: ogni voce è un termine italiano con le sue
+# traduzioni nelle altre lingue. Un indice invertito n-gramma -> voci
+# permette di trovare i termini simili toccando solo le voci che hanno
+# almeno un n-gramma in comune, senza confrontare tutte le coppie.
+class TranslationMemory:
+    def __init__(self):
+        self.terms = []
+        self.translations = []
+        self._sizes = []
+        self._exact = {}
+        self._index = defaultdict(list)
+
+    def add(self, term, locale, translation):
+        key = normalize(term)
+        entry = self._exact.get(key)
+        if entry is None:
+            entry = self._exact[key] = len(self.terms)
+            self.terms.append(term)
+            self.translations.append({})
+            grams = ngrams(term)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._index[gram].append(entry)
+        # A parità di termine vale la prima traduzione incontrata
+        self.translations[entry].setdefault(locale, translation)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def exact(self, term, locale):
+        entry = self._exact.get(normalize(term))
+        return None if entry is None else self.translations[entry].get(locale)
+
+    # Termini simili ordinati per somiglianza: (somiglianza, termine, traduzioni)
+    def matches(self, term, limit=MAX_MATCHES, min_similarity=MIN_SIMILARITY):
+        grams = ngrams(term)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._index.get(gram, ()))
+        scored = []
+        for entry, count in shared.items():
+            similarity = 2 * count / (len(grams) + self._sizes[entry])
+            if similarity >= min_similarity:
+                scored.append((similarity, entry))
+        scored.sort(key=lambda item: (-item[0], self.terms[item[1]]))
+        return [(round(similarity, 3), self.terms[entry], self.translations[entry]) for similarity, entry in scored[:limit]]
+
+    # Funzione per proporre la traduzione di un nuovo termine in una lingua:
+    # - "exact": il termine è già tradotto;
+    # - "number": differisce da un termine simile solo per numeri o parti
+    #   riportate tali e quali nella traduzione ('Laptop 13"' -> 'Laptop 16"');
+    # - "word": differisce per una parola che la memoria sa tradurre
+    #   ('Fodera in Pelle' da 'Fodera in Raso', con 'Pelle' -> 'Leather' noto);
+    # - "fuzzy": traduzione del termine più simile, da rivedere.
+    def suggest(self, term, locale):
+        translation = self.exact(term, locale)
+        if translation is not None:
+            return {"suggestion": translation, "method": "exact", "similarity": 1.0, "match": term}
+
+        candidates = [
+            (similarity, match, match_translations[locale])
+            for similarity, match, match_translations in self.matches(term)
+            if locale in match_translations
+        ]
+        for similarity, match, match_translation in candidates:
+            substituted = self._substitute(term, match, match_translation, locale, candidates)
+            if substituted is not None:
+                suggestion, method = substituted
+                return {"suggestion": suggestion, "method": method, "similarity": similarity, "match": match}
+        if candidates:
+            similarity, match, match_translation = candidates[0]
+            return {"suggestion": match_translation, "method": "fuzzy", "similarity": similarity, "match": match}
+        return None
+
+    # Funzione per sostituire nella traduzione di un termine simile l'unica
+    # parte in cui i due termini differiscono
+    def _substitute(self, term, match, match_translation, locale, candidates=()):
+        new_part, old_part = _differing_parts(term, match)
+        if new_part is None:
+            return None
+        if _is_verbatim(old_part) and _is_verbatim(new_part) and old_part in match_translation:
+            return match_translation.replace(old_part, new_part, 1), "number"
+        new_translation = self.exact(new_part, locale)
+        if not new_translation:
+            return None
+        old_translation = self.exact(old_part, locale) or _frame_part(match, old_part, match_translation, candidates)
+        if old_translation and new_translation and old_translation in match_translation:
+            return match_translation.replace(old_translation, new_translation, 1), "word"
+        return None
+
+
+# Funzione per trovare la parte centrale in cui due termini differiscono,
+# a livello di parole: restituisce (parte nuova, parte vecchia) oppure
+# (None, None) se i termini non hanno né inizio né fine in comune
+def _differing_parts(term, match):
+    new_words = list(WORD.finditer(term))
+    old_words = list(WORD.finditer(match))
+    prefix = 0
+    while (prefix < min(len(new_words), len(old_words))
+           and new_words[prefix].group().lower() == old_words[prefix].group().lower()):
+        prefix += 1
+    suffix = 0
+    while (suffix < min(len(new_words), len(old_words)) - prefix
+           and new_words[-1 - suffix].group().lower() == old_words[-1 - suffix].group().lower()):
+        suffix += 1
+    if prefix == 0 and suffix == 0:
+        return None, None
+    new_middle = new_words[prefix:len(new_words) - suffix]
+    old_middle = old_words[prefix:len(old_words) - suffix]
+    if not new_middle or not old_middle:
+        return None, None
+    return (
+        term[new_middle[0].start():new_middle[-1].end()],
+        match[old_middle[0].start():old_middle[-1].end()],
+    )
+
+
+# Funzione per ricavare come è tradotta la parte variabile di un termine
+# confrontandolo con un altro termine dello stesso schema: da
+# 'Fodera in Raso' -> 'Satin Lining' e 'Fodera in Cotone' -> 'Cotton Lining'
+# si ricava che 'Raso' corrisponde a 'Satin'
+def _frame_part(match, old_part, match_translation, candidates):
+    for _similarity, other, other_translation in candidates:
+        if other == match or _differing_parts(match, other)[0] != old_part:
+            continue
+        translated_part, _other_part = _differing_parts(match_translation, other_translation)
+        if translated_part:
+            return translated_part
+    return None
+
+
+# Le parti fatte solo di numeri e simboli si riportano tali e quali
+def _is_verbatim(part):
+    return not any(character.isalpha() for character in part)
+
+
+# Funzione per costruire la memoria dai file trait_elements.php (coppie
+# italiano -> lingua per ogni voce) e dai dizionari di translate_traits
+def build_memory(locales=LOCALES, directory=lang_dir):
+    memory = TranslationMemory()
+    template = parse_trait_file(trait_path(SOURCE_LOCALE, directory))
+    for locale in locales:
+        if locale == SOURCE_LOCALE:
+            continue
+        values = locale_values(trait_path(locale, directory))
+        for item in template:
+            if isinstance(item, str):
+                continue
+            _indent, section, key, occurrence, italian, _ending = item
+            translation = values.get((section, key, occurrence))
+            if translation is not None:
+                memory.add(italian, locale, translation)
+        if locale in translations:
+            for italian, translation in translations[locale].items():
+                memory.add(italian, locale, translation)
+    return memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggerisce le traduzioni di nuovi valori dei traits")
+    parser.add_argument("terms", nargs="*", help="Termini italiani da tradurre")
+    parser.add_argument("--input", help="File con un termine per riga")
+    parser.add_argument("--lang-dir", default=lang_dir, help=f"Cartella delle lingue (default: {lang_dir})")
+    parser.add_argument("--locales", default=",".join(locale for locale in LOCALES if locale != SOURCE_LOCALE),
+                        help="Lingue per cui proporre una traduzione, separate da virgola")
+    parser.add_argument("--json", action="store_true", help="Stampa i suggerimenti in JSON")
+    args = parser.parse_args()
+
+    terms = list(args.terms)
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as file:
+            terms.extend(line.strip() for line in file if line.strip())
+    if not terms:
+        parser.error("indicare almeno un termine oppure --input")
+    locales = tuple(locale.strip() for locale in args.locales.split(",") if locale.strip())
+
+    started = time.perf_counter()
+    memory = build_memory(directory=args.lang_dir)
+    built = time.perf_counter()
+    suggestions = {term: {locale: memory.suggest(term, locale) for locale in locales} for term in terms}
+    elapsed = time.perf_counter() - built
+
+    if args.json:
+        print(json.dumps(suggestions, ensure_ascii=False, indent=4))
+    else:
+        for term, by_locale in suggestions.items():
+            print(term)
+            for locale, suggestion in by_locale.items():
+                if suggestion is None:
+                    print(f"  {locale}: -")
+                else:
+                    print(f"  {locale}: {suggestion['suggestion']} "
+                          f"({suggestion['method']}, {suggestion['similarity']:.2f} da '{suggestion['match']}')")
+    print(
+        f"{len(memory)} termini in memoria (costruita in {(built - started) * 1000:.1f} ms), "
+        f"{len(terms)} termini tradotti in {elapsed * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()